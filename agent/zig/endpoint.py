@@ -12,6 +12,8 @@ import uvicorn
 from copilotkit.integrations.fastapi import add_fastapi_endpoint
 from copilotkit import CopilotKitRemoteEndpoint, LangGraphAgent
 from agent.zig.graph import graph
+from zig.tools.apollo import close_session as close_apollo_session
+from zig.tools.unipile import close_session as close_unipile_session
 
 app = FastAPI()
 sdk = CopilotKitRemoteEndpoint(
@@ -25,6 +27,8 @@ sdk = CopilotKitRemoteEndpoint(
 )
 
 add_fastapi_endpoint(app, sdk, "/copilotkit")
+app.add_event_handler("shutdown", close_apollo_session)
+app.add_event_handler("shutdown", close_unipile_session)
 
 def main():
     """Run the uvicorn server."""
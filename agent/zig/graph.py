@@ -1,7 +1,7 @@
-from typing import List, AsyncIterator
+from typing import Any, Dict, Iterable, List, AsyncIterator, Tuple
 from typing_extensions import Literal
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, AIMessage, ToolMessage
+from langchain_core.messages import SystemMessage, AIMessage, AIMessageChunk, ToolMessage, message_chunk_to_message
 from langchain_core.runnables import RunnableConfig
 from langchain.tools import tool
 from langgraph.graph import StateGraph, END
@@ -11,16 +11,43 @@ from copilotkit import CopilotKitState
 from zig.tools.apollo.search import people_search, organization_search, organization_job_postings
 from zig.tools.apollo.translation.search import PeopleSearchData
 from copilotkit.langgraph import copilotkit_emit_state
+from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
+import json
 import uuid
 # from zig.tools.apollo.enrich import people_enrichment, bulk_people_enrichment, organization_enrichment, bulk_organization_enrichment
 
+@dataclass(slots=True, frozen=True)
 class ProgressLog:
-    def __init__(self, message: str, log_type: str = "info"):
-        self.id = str(uuid.uuid4())
-        self.message = message
-        self.timestamp = datetime.now()
-        self.type = log_type
+    message: str
+    type: str = "info"
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # Stored as an ISO string so the log serializes without conversion
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "message": self.message,
+            "timestamp": self.timestamp,
+            "type": self.type
+        }
+
+# Upper bound on the progress logs kept in state, every emit re-sends the whole list
+MAX_LOGS = 50
+
+def append_log(logs: List[dict], log: ProgressLog) -> None:
+    """
+    Appends a progress log, replacing any earlier record with the same content and
+    keeping only the MAX_LOGS most recent records.
+    """
+    logs[:] = [
+        record for record in logs
+        if record["message"] != log.message or record["type"] != log.type
+    ]
+    logs.append(log.as_dict())
+    del logs[:-MAX_LOGS]
 
 class AgentState(CopilotKitState):
     people: List[PeopleSearchData]
@@ -31,84 +58,178 @@ tools = [
     people_search,
     # your_tool_here
 ]
+tools_by_name = {tool.name: tool for tool in tools}
+
+# The system prompt only depends on the conversation language, so it is built
+# once and stays byte-identical across turns
+system_prompt_template = (
+    "You are Ebisu AI, a helpful sales prospect research assistant. Talk in {language}. "
+    "You have access to powerful people search tools through Apollo. "
+    "When users ask you to search for people/prospects, use the people_search tool to find relevant contacts. "
+    "You can search by job titles, company names, locations, and other criteria. "
+    "Examples of good search queries: "
+    "- 'Find software engineers at tech companies in San Francisco' "
+    "- 'Search for marketing managers at SaaS companies' "
+    "- 'Look for sales directors in the healthcare industry' "
+    "Always be helpful and provide context about the search results you find. "
+    f"Available tools: {[tool.name for tool in tools]}"
+)
+
+# Read-only tools that may start before the model has finished its turn
+speculative_tools = {"people_search"}
+
+# Tool calls started while the model was still streaming, keyed by tool call id
+_speculative_calls: Dict[str, Tuple[dict, asyncio.Task]] = {}
+
+def _start_speculative_calls(response: AIMessageChunk, started: List[str]) -> None:
+    """
+    Starts the read-only tool calls that the model has finished emitting, adding
+    their ids to started.
+
+    Tool calls are streamed one after another, so every call but the last one is
+    complete once a later call has started. Executing them right away overlaps the
+    tool latency with the decoding of the remaining calls.
+    """
+    for tool_call_chunk in response.tool_call_chunks[:-1]:
+        tool_call_id = tool_call_chunk.get("id")
+        if tool_call_chunk.get("name") not in speculative_tools or tool_call_id in _speculative_calls:
+            continue
+        try:
+            args = json.loads(tool_call_chunk.get("args") or "{}")
+        except ValueError:
+            continue
+        task = asyncio.create_task(tools_by_name[tool_call_chunk["name"]].ainvoke(args))
+        _speculative_calls[tool_call_id] = (args, task)
+        started.append(tool_call_id)
+
+def _cancel_speculative_calls(tool_call_ids: Iterable[str]) -> None:
+    for tool_call_id in tool_call_ids:
+        speculative = _speculative_calls.pop(tool_call_id, None)
+        if speculative is not None:
+            speculative[1].cancel()
+
+def _only_action_calls(response: AIMessage, action_names: set) -> AIMessage:
+    """
+    Returns a copy of the response without the tool calls of backend tools.
+
+    When a turn mixes CopilotKit actions with backend tool calls, the graph ends so
+    the frontend can run the actions, and the backend calls never get a ToolMessage.
+    OpenAI rejects a history with unanswered tool calls, so they are dropped from the
+    message instead; the model can issue them again on the next turn.
+    """
+    additional_kwargs = dict(response.additional_kwargs)
+    if "tool_calls" in additional_kwargs:
+        additional_kwargs["tool_calls"] = [
+            tool_call for tool_call in additional_kwargs["tool_calls"]
+            if tool_call.get("function", {}).get("name") in action_names
+        ]
+    return response.model_copy(update={
+        "tool_calls": [tool_call for tool_call in response.tool_calls if tool_call["name"] in action_names],
+        "invalid_tool_calls": [
+            tool_call for tool_call in response.invalid_tool_calls if tool_call.get("name") in action_names
+        ],
+        "additional_kwargs": additional_kwargs,
+    })
+
+async def _run_tool_call(tool_call: dict) -> Any:
+    """
+    Executes a tool call, reusing its speculative execution when the final
+    arguments match the ones it was started with.
+
+    Raises:
+        ValueError: If the model called a tool that does not exist.
+    """
+    speculative = _speculative_calls.pop(tool_call["id"], None)
+    if speculative is not None:
+        args, task = speculative
+        if args == tool_call["args"]:
+            return await task
+        task.cancel()
+    tool_to_run = tools_by_name.get(tool_call["name"])
+    if tool_to_run is None:
+        # Answered like ToolNode answers unknown tools, so the model can correct itself
+        raise ValueError(f"{tool_call['name']} is not a valid tool, try one of {list(tools_by_name)}.")
+    return await tool_to_run.ainvoke(tool_call["args"])
+
+def _tool_message(tool_call: dict, tool_result: Any) -> ToolMessage:
+    """
+    Builds the answer to a tool call, an error message when the call failed.
+    """
+    if isinstance(tool_result, BaseException):
+        return ToolMessage(
+            content=f"Error: {tool_result!r}\n Please fix your mistakes.",
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+    return ToolMessage(
+        content=f"Found {len(tool_result)} people." if tool_call["name"] == "people_search" else str(tool_result),
+        tool_call_id=tool_call["id"],
+    )
 
 async def tool_node(state: AgentState, config: RunnableConfig) -> AsyncIterator[AgentState]:
     """
     This node executes tools available to the agent and emits progress updates.
+    All tool calls of the last message are executed concurrently.
     """
-    tool_call = state["messages"][-1].tool_calls[0]
+    tool_calls = state["messages"][-1].tool_calls
     
-    if tool_call["name"] == "people_search":
+    if any(tool_call["name"] == "people_search" for tool_call in tool_calls):
         # Initialize logs if not present
         current_logs = state.get("logs", [])
         
         # Log: Starting search
-        start_log = ProgressLog("🔍 Starting people search...", "progress")
-        current_logs.append({
-            "id": start_log.id,
-            "message": start_log.message,
-            "timestamp": start_log.timestamp.isoformat(),
-            "type": start_log.type
-        })
+        append_log(current_logs, ProgressLog("🔍 Starting people search...", "progress"))
         
-        # Emit initial progress state
-        searching_state = dict(state)
-        searching_state["logs"] = current_logs
-        searching_state["current_status"] = "Searching for people..."
-        searching_state["messages"] = state["messages"] + [AIMessage(content="*Searching for people...* 🕵️")]
-        await copilotkit_emit_state(config, searching_state)
-
         # Log: Executing search
-        exec_log = ProgressLog("⚡ Executing Apollo people search API...", "progress")
-        current_logs.append({
-            "id": exec_log.id,
-            "message": exec_log.message,
-            "timestamp": exec_log.timestamp.isoformat(),
-            "type": exec_log.type
-        })
+        append_log(current_logs, ProgressLog("⚡ Executing Apollo people search API...", "progress"))
         
-        # Emit execution progress
-        exec_state = dict(state)
-        exec_state["logs"] = current_logs
-        exec_state["current_status"] = "Executing search..."
-        await copilotkit_emit_state(config, exec_state)
-
-        # Execute the search
-        result = await people_search.ainvoke(tool_call["args"])
+        # Single shallow copy of the state, updated in place between emits.
+        # The logs list is shared, so appends show up without reassignment.
+        emit_state = dict(state)
+        emit_state["logs"] = current_logs
+
+        # Emit start and execution progress as a single state update. The
+        # transient progress is reported through current_status only, so the
+        # message history is not copied for it.
+        emit_state["current_status"] = "Searching for people..."
+        await copilotkit_emit_state(config, emit_state)
+
+        # Execute all tool calls concurrently, one progress update per batch.
+        # A failed call yields its exception, answered with an error message,
+        # so it does not abort the others.
+        results = await asyncio.gather(*(
+            _run_tool_call(tool_call)
+            for tool_call in tool_calls
+        ), return_exceptions=True)
+        result = [
+            person
+            for tool_call, tool_result in zip(tool_calls, results)
+            if tool_call["name"] == "people_search" and not isinstance(tool_result, BaseException)
+            for person in tool_result
+        ]
         
+        people_found = len(result)
+
         # Log: Search completed
-        success_log = ProgressLog(f"✅ Found {len(result)} people successfully!", "success")
-        current_logs.append({
-            "id": success_log.id,
-            "message": success_log.message,
-            "timestamp": success_log.timestamp.isoformat(),
-            "type": success_log.type
-        })
+        append_log(current_logs, ProgressLog(f"✅ Found {people_found} people successfully!", "success"))
         
         # Log: Processing results
-        process_log = ProgressLog("🔄 Processing and formatting results...", "progress")
-        current_logs.append({
-            "id": process_log.id,
-            "message": process_log.message,
-            "timestamp": process_log.timestamp.isoformat(),
-            "type": process_log.type
-        })
+        append_log(current_logs, ProgressLog("🔄 Processing and formatting results...", "progress"))
         
-        # Create the final updated state with people data and logs
-        final_state = dict(state)
-        final_state["people"] = result
-        final_state["logs"] = current_logs
-        final_state["current_status"] = f"Search completed - {len(result)} people found"
-        final_state["messages"] = state["messages"] + [AIMessage(content=f"Found {len(result)} people. ✅")]
+        # Update the state with people data and the terminal message
+        emit_state["people"] = result
+        emit_state["current_status"] = f"Search completed - {people_found} people found"
+        emit_state["messages"] = state["messages"] + [AIMessage(content=f"Found {people_found} people. ✅")]
         
         # Emit the final state with people data and complete logs
-        await copilotkit_emit_state(config, final_state)
+        await copilotkit_emit_state(config, emit_state)
         
-        tool_message = ToolMessage(
-            content=f"Found {len(result)} people.",
-            tool_call_id=tool_call["id"],
-        )
-        yield {"people": result, "logs": current_logs, "current_status": f"Ready - {len(result)} people loaded", "messages": [tool_message]}
+        # Answer every tool call, in the order the model issued them
+        tool_messages = [
+            _tool_message(tool_call, tool_result)
+            for tool_call, tool_result in zip(tool_calls, results)
+        ]
+        yield {"people": result, "logs": current_logs, "current_status": f"Ready - {people_found} people loaded", "messages": tool_messages}
     else:
         tool_node_instance = ToolNode(tools)
         yield await tool_node_instance.ainvoke(state)
@@ -125,24 +246,14 @@ async def chat_node(state: AgentState, config: RunnableConfig) -> Command[Litera
             *tools
         ],
 
-        # 2.1 Disable parallel tool calls to avoid race conditions,
-        #     enable this for faster performance if you want to manage
-        #     the complexity of running tool calls in parallel.
-        parallel_tool_calls=False,
+        # 2.1 Enable parallel tool calls, tool_node executes all calls of
+        #     a turn concurrently.
+        parallel_tool_calls=True,
     )
 
     # 3. Define the system message by which the chat model will be run
     system_message = SystemMessage(
-        content=f"You are Ebisu AI, a helpful sales prospect research assistant. Talk in {state.get('language', 'english')}. "
-        f"You have access to powerful people search tools through Apollo. "
-        f"When users ask you to search for people/prospects, use the people_search tool to find relevant contacts. "
-        f"You can search by job titles, company names, locations, and other criteria. "
-        f"Examples of good search queries: "
-        f"- 'Find software engineers at tech companies in San Francisco' "
-        f"- 'Search for marketing managers at SaaS companies' "
-        f"- 'Look for sales directors in the healthcare industry' "
-        f"Always be helpful and provide context about the search results you find. "
-        f"Available tools: {[tool.name for tool in tools]}"
+        content=system_prompt_template.format(language=state.get('language', 'english'))
     )
 
     # 4. Emit initial ready state if no logs exist
@@ -152,25 +263,49 @@ async def chat_node(state: AgentState, config: RunnableConfig) -> Command[Litera
         initial_state["current_status"] = "Ready to help you find prospects"
         await copilotkit_emit_state(config, initial_state)
 
-    # 5. Run the model to generate a response
-    response = await model_with_tools.ainvoke([
-        system_message,
-        *state["messages"],
-    ], config)
+    # 5. Stream the model response, tokens reach the UI as they arrive
+    #    and the chunks are accumulated into the final message. Tool calls
+    #    that are complete start executing while the rest is decoded.
+    response = None
+    started: List[str] = []
+    try:
+        async for chunk in model_with_tools.astream([
+            system_message,
+            *state["messages"],
+        ], config):
+            response = chunk if response is None else response + chunk
+            if chunk.tool_call_chunks:
+                _start_speculative_calls(response, started)
+        response = message_chunk_to_message(response)
+    except BaseException:
+        # The stream failed or the run was cancelled, nothing will claim the
+        # speculative executions of this turn
+        _cancel_speculative_calls(started)
+        raise
+
+    # Speculative executions that don't match a final tool call are never claimed
+    final_ids = {tool_call["id"] for tool_call in getattr(response, "tool_calls", [])}
+    _cancel_speculative_calls(tool_call_id for tool_call_id in started if tool_call_id not in final_ids)
 
     # 6. Check for tool calls in the response and handle them. We ignore
     #    CopilotKit actions, as they are handled by CopilotKit.
     if isinstance(response, AIMessage) and response.tool_calls:
         actions = state["copilotkit"]["actions"]
 
-        # 6.1 Check for any non-copilotkit actions in the response and
-        #     if there are none, go to the tool node.
+        # 6.1 If none of the tool calls are copilotkit actions, go to
+        #     the tool node.
+        action_names = {action.get("name") for action in actions}
         if not any(
-            action.get("name") == response.tool_calls[0].get("name")
-            for action in actions
+            tool_call.get("name") in action_names
+            for tool_call in response.tool_calls
         ):
             return Command(goto="tool_node", update={"messages": [response]})
 
+        # 6.2 The tool node won't run, drop the speculative executions and
+        #     the backend tool calls that would be left unanswered
+        _cancel_speculative_calls(final_ids)
+        response = _only_action_calls(response, action_names)
+
     # 7. We've handled all tool calls, so we can end the graph.
     return Command(
         goto=END,
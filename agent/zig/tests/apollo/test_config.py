@@ -0,0 +1,29 @@
+"""
+Tests for the Apollo request helper (zig/tools/apollo/config.py).
+"""
+
+import unittest
+from unittest.mock import patch
+
+from zig.tests.fakes import FakeResponse, FakeSession
+from zig.tools.apollo import config
+
+class MakeRequestTest(unittest.IsolatedAsyncioTestCase):
+    async def request(self, session: FakeSession):
+        with patch.object(config, "get_session", return_value=session):
+            return await config.make_request("POST", "/v1/x", "Request failed", json={"q": 1})
+
+    async def test_retries_after_a_short_retry_after(self):
+        session = FakeSession(FakeResponse(503, headers={"Retry-After": "0"}), FakeResponse(200, b'{"ok": true}'))
+        self.assertEqual(await self.request(session), {"ok": True})
+        self.assertEqual(len(session.requests), 2)
+
+    async def test_fails_fast_when_retry_after_exceeds_the_cap(self):
+        session = FakeSession(FakeResponse(429, b"quota", {"Retry-After": "3600"}), FakeResponse(200))
+        with self.assertRaises(config.ApolloError) as raised:
+            await self.request(session)
+        self.assertEqual(raised.exception.status, 429)
+        self.assertEqual(len(session.requests), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for the people match batcher (zig/tools/apollo/enrich.py).
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from zig.tools.apollo import enrich
+from zig.tools.apollo.config import ApolloError
+
+class PersonMatchBatcherTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.paths = []
+        self.batcher = enrich._PersonMatchBatcher(0.01, 10)
+        patcher = patch.object(enrich, "make_request", self.fake_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def fake_request(self, method, path, error_message, json=None, params=None):
+        self.paths.append(path)
+        await asyncio.sleep(0.001)
+        if path.endswith("bulk_match"):
+            if any(details.get("name") == "bad" for details in json["details"]):
+                raise ApolloError(422, "invalid entry", error_message)
+            return {"matches": [{"name": details["name"]} for details in json["details"]]}
+        if json.get("name") == "bad":
+            raise ApolloError(422, "invalid entry", error_message)
+        return {"person": {"name": json["name"]}}
+
+    async def test_concurrent_lookups_are_sent_as_one_bulk_request(self):
+        results = await asyncio.gather(*(self.batcher.submit({"name": name}) for name in ("a", "b")))
+        self.assertEqual(results, [{"person": {"name": "a"}}, {"person": {"name": "b"}}])
+        self.assertEqual(self.paths, ["/v1/people/bulk_match"])
+
+    async def test_solo_lookup_has_the_same_shape(self):
+        self.assertEqual(await self.batcher.submit({"name": "solo"}), {"person": {"name": "solo"}})
+        self.assertEqual(self.paths, ["/v1/people/match"])
+
+    async def test_bad_entry_only_fails_its_own_lookup(self):
+        results = await asyncio.gather(
+            *(self.batcher.submit({"name": name}) for name in ("a", "bad", "c")),
+            return_exceptions=True
+        )
+        self.assertEqual(results[0], {"person": {"name": "a"}})
+        self.assertIsInstance(results[1], ApolloError)
+        self.assertEqual(results[2], {"person": {"name": "c"}})
+        self.assertEqual(self.paths.count("/v1/people/match"), 3)
+
+    async def test_lookups_with_different_shared_parameters_are_not_mixed(self):
+        await asyncio.gather(
+            self.batcher.submit({"name": "a", "reveal_personal_emails": True}),
+            self.batcher.submit({"name": "b"})
+        )
+        self.assertEqual(self.paths, ["/v1/people/match", "/v1/people/match"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Test doubles for the aiohttp session shared by the API clients.
+"""
+
+from typing import Dict, List, Optional
+
+class FakeResponse:
+    def __init__(self, status: int, body: bytes = b'{}', headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.ok = status < 400
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self) -> str:
+        return self.body.decode()
+
+class FakeSession:
+    """
+    Answers requests with the queued responses, in order, and records each request.
+    """
+    closed = False
+
+    def __init__(self, *responses: FakeResponse):
+        self.responses: List[FakeResponse] = list(responses)
+        self.requests: List[dict] = []
+
+    def request(self, *args, **kwargs) -> FakeResponse:
+        self.requests.append(kwargs)
+        return self.responses.pop(0)
@@ -0,0 +1,112 @@
+"""
+Tests for the tool execution of the agent graph (zig/graph.py).
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from zig import graph
+
+class FakeSearch:
+    """
+    Stands in for people_search: returns one person per query, fails on "bad".
+    """
+    name = "people_search"
+
+    def __init__(self, delay: float = 0.001):
+        self.delay = delay
+        self.calls = []
+
+    async def ainvoke(self, args):
+        self.calls.append(args)
+        await asyncio.sleep(self.delay)
+        if args.get("q") == "bad":
+            raise RuntimeError("Apollo is down")
+        return [{"name": args["q"]}]
+
+class GraphTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.search = FakeSearch()
+        for patcher in (
+            patch.dict(graph.tools_by_name, {"people_search": self.search}, clear=True),
+            patch.object(graph, "copilotkit_emit_state", AsyncMock()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(graph._speculative_calls.clear)
+
+class ToolNodeTest(GraphTestCase):
+    async def run_tool_node(self, tool_calls):
+        state = {"messages": [AIMessage(content="", tool_calls=tool_calls)], "logs": []}
+        return [update async for update in graph.tool_node(state, {})][-1]
+
+    async def test_every_call_is_answered(self):
+        update = await self.run_tool_node([
+            {"name": "people_search", "args": {"q": "a"}, "id": "ok"},
+            {"name": "people_search", "args": {"q": "bad"}, "id": "failed"},
+            {"name": "unknown_tool", "args": {}, "id": "unknown"},
+        ])
+        messages = {message.tool_call_id: message for message in update["messages"]}
+        self.assertEqual(list(messages), ["ok", "failed", "unknown"])
+        self.assertEqual(messages["ok"].content, "Found 1 people.")
+        self.assertEqual(messages["failed"].status, "error")
+        self.assertIn("Apollo is down", messages["failed"].content)
+        self.assertEqual(messages["unknown"].status, "error")
+        self.assertIn("unknown_tool is not a valid tool", messages["unknown"].content)
+        self.assertEqual(update["people"], [{"name": "a"}])
+
+    async def test_people_are_merged_across_calls(self):
+        update = await self.run_tool_node([
+            {"name": "people_search", "args": {"q": "a"}, "id": "1"},
+            {"name": "people_search", "args": {"q": "b"}, "id": "2"},
+        ])
+        self.assertEqual(update["people"], [{"name": "a"}, {"name": "b"}])
+
+class SpeculativeCallsTest(GraphTestCase):
+    def streamed(self, *calls):
+        return AIMessageChunk(content="", tool_call_chunks=[
+            {"name": name, "args": args, "id": tool_call_id, "index": index}
+            for index, (name, args, tool_call_id) in enumerate(calls)
+        ])
+
+    async def test_complete_calls_start_while_streaming(self):
+        started = []
+        graph._start_speculative_calls(self.streamed(
+            ("people_search", '{"q": "a"}', "1"),
+            ("people_search", '{"q": "b', "2"),
+        ), started)
+        # The last call may still be streaming, so only the first one starts
+        self.assertEqual(started, ["1"])
+
+        result = await graph._run_tool_call({"name": "people_search", "args": {"q": "a"}, "id": "1"})
+        self.assertEqual(result, [{"name": "a"}])
+        self.assertEqual(self.search.calls, [{"q": "a"}])
+
+    async def test_changed_arguments_run_the_call_again(self):
+        started = []
+        graph._start_speculative_calls(self.streamed(
+            ("people_search", '{"q": "a"}', "1"),
+            ("people_search", "", "2"),
+        ), started)
+        result = await graph._run_tool_call({"name": "people_search", "args": {"q": "c"}, "id": "1"})
+        self.assertEqual(result, [{"name": "c"}])
+
+    async def test_unclaimed_calls_are_cancelled(self):
+        self.search.delay = 10
+        started = []
+        graph._start_speculative_calls(self.streamed(
+            ("people_search", '{"q": "a"}', "1"),
+            ("people_search", "", "2"),
+        ), started)
+        task = graph._speculative_calls["1"][1]
+
+        graph._cancel_speculative_calls(started)
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(graph._speculative_calls, {})
+
+if __name__ == "__main__":
+    unittest.main()
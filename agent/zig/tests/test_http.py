@@ -0,0 +1,313 @@
+"""
+Tests for the shared HTTP client primitives (zig/tools/http.py).
+
+Run from the agent directory with: python -m unittest discover -s zig/tests -t .
+"""
+
+import asyncio
+import random
+import time
+import unittest
+from email.utils import formatdate
+
+from zig.tools.http import (
+    AdaptiveConcurrencyLimiter,
+    SharedSession,
+    SingleFlight,
+    TokenBucket,
+    retry_delay,
+    ttl_cache
+)
+
+class ApiError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"API error: {status}")
+        self.status = status
+
+class AdaptiveConcurrencyLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_mixed_and_noisy_latencies_keep_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(20)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            await limiter.acquire()
+            peak = max(peak, limiter.in_flight)
+            # A 70/30 mix of fast reads and slow searches, each with lognormal noise
+            base = 0.001 if random.random() < 0.7 else 0.01
+            await asyncio.sleep(base * random.lognormvariate(0, 0.5))
+            await limiter.release(False)
+
+        await asyncio.gather(*(request() for _ in range(500)))
+        self.assertEqual(limiter.limit, 20)
+        self.assertLessEqual(peak, 20)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_overload_shrinks_the_limit_and_success_restores_it(self):
+        limiter = AdaptiveConcurrencyLimiter(20)
+        for _ in range(5):
+            await limiter.acquire()
+            await limiter.release(True)
+        self.assertAlmostEqual(limiter.limit, 20 * 0.9 ** 5)
+
+        for _ in range(200):
+            await limiter.acquire()
+            await limiter.release(False)
+        self.assertEqual(limiter.limit, 20)
+
+    async def test_limit_never_drops_below_one(self):
+        limiter = AdaptiveConcurrencyLimiter(4, overload_rate=0.5)
+        for _ in range(20):
+            await limiter.acquire()
+            await limiter.release(True)
+        self.assertEqual(limiter.limit, 1.0)
+
+    async def test_waits_for_a_free_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        await limiter.release(False)
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertEqual(limiter.in_flight, 1)
+
+class TokenBucketTest(unittest.IsolatedAsyncioTestCase):
+    async def test_fractional_rate_paces_calls(self):
+        # 0.5 calls per 0.1s: one call every 0.2s
+        bucket = TokenBucket(0.5, period=0.1)
+        started = time.monotonic()
+        await asyncio.wait_for(bucket.acquire(), timeout=1)
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        await asyncio.wait_for(bucket.acquire(), timeout=1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    async def test_bursts_up_to_rate(self):
+        bucket = TokenBucket(3, period=60)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        self.assertLess(time.monotonic() - started, 0.05)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(bucket.acquire(), timeout=0.05)
+
+    async def test_pause_holds_back_calls(self):
+        bucket = TokenBucket(10, period=1)
+        bucket.pause(0.1)
+        started = time.monotonic()
+        await bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_rejects_non_positive_rates(self):
+        for rate in (0, -1):
+            with self.assertRaises(ValueError):
+                TokenBucket(rate)
+
+class EventLoopTest(unittest.TestCase):
+    def test_primitives_work_across_event_loops(self):
+        bucket = TokenBucket(100, period=1)
+        limiter = AdaptiveConcurrencyLimiter(1)
+        flight = SingleFlight()
+
+        async def use():
+            async def request():
+                await bucket.acquire()
+                await limiter.acquire()
+                await asyncio.sleep(0.001)
+                await limiter.release(False)
+            await asyncio.gather(request(), request())
+
+            async def value():
+                await asyncio.sleep(0.001)
+                return 1
+            return await asyncio.gather(flight.run("key", value), flight.run("key", value))
+
+        self.assertEqual(asyncio.run(use()), [1, 1])
+        self.assertEqual(asyncio.run(use()), [1, 1])
+
+    def test_session_is_rebuilt_for_a_new_event_loop(self):
+        class FakeSession:
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        sessions = []
+
+        def factory():
+            sessions.append(FakeSession())
+            return sessions[-1]
+
+        shared = SharedSession(factory)
+
+        async def get_twice():
+            return shared.get(), shared.get()
+
+        first, again = asyncio.run(get_twice())
+        self.assertIs(first, again)
+        second, _ = asyncio.run(get_twice())
+        self.assertIsNot(first, second)
+
+        asyncio.run(shared.close())
+        # Closing from another loop drops the session without touching it
+        self.assertFalse(second.closed)
+        self.assertEqual(len(sessions), 2)
+
+class RetryDelayTest(unittest.TestCase):
+    def test_honors_retry_after_seconds(self):
+        self.assertEqual(retry_delay("5", 0, 60), 5.0)
+        self.assertEqual(retry_delay("-5", 0, 60), 0.0)
+
+    def test_honors_retry_after_date(self):
+        delay = retry_delay(formatdate(time.time() + 30, usegmt=True), 0, 60)
+        self.assertGreater(delay, 25)
+        self.assertLessEqual(delay, 30)
+
+    def test_gives_up_when_retry_after_exceeds_the_cap(self):
+        self.assertIsNone(retry_delay("3600", 0, 60))
+        self.assertIsNone(retry_delay(formatdate(time.time() + 3600, usegmt=True), 0, 60))
+
+    def test_backs_off_without_a_usable_header(self):
+        for header in (None, "soon"):
+            for attempt in range(4):
+                delay = retry_delay(header, attempt, 60)
+                self.assertGreaterEqual(delay, 0)
+                self.assertLessEqual(delay, 0.5 * 2 ** attempt)
+
+class TtlCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = 0
+
+    async def fetch(self, name, force_refresh=False):
+        self.calls += 1
+        await asyncio.sleep(0.001)
+        if name == "missing":
+            raise ApiError(404)
+        if name == "busy":
+            raise ApiError(429)
+        return {"name": name, "call": self.calls}
+
+    async def test_hit_and_expiry(self):
+        fetch = ttl_cache(ttl=0.05)(self.fetch)
+        first = await fetch("a")
+        self.assertIs(await fetch("a"), first)
+        self.assertEqual(self.calls, 1)
+
+        await fetch("b")
+        self.assertEqual(self.calls, 2)
+
+        await asyncio.sleep(0.06)
+        self.assertIsNot(await fetch("a"), first)
+        self.assertEqual(self.calls, 3)
+
+    async def test_force_refresh_skips_the_lookup_and_stores(self):
+        fetch = ttl_cache(ttl=60)(self.fetch)
+        await fetch("a")
+        refreshed = await fetch("a", force_refresh=True)
+        self.assertEqual(refreshed["call"], 2)
+        self.assertIs(await fetch("a"), refreshed)
+        self.assertEqual(self.calls, 2)
+
+    async def test_error_ttl_caches_client_errors_only(self):
+        fetch = ttl_cache(ttl=60, error_ttl=0.05)(self.fetch)
+        for _ in range(2):
+            with self.assertRaises(ApiError):
+                await fetch("missing")
+        self.assertEqual(self.calls, 1)
+
+        await asyncio.sleep(0.06)
+        with self.assertRaises(ApiError):
+            await fetch("missing")
+        self.assertEqual(self.calls, 2)
+
+        for _ in range(2):
+            with self.assertRaises(ApiError):
+                await fetch("busy")
+        self.assertEqual(self.calls, 4)
+
+    async def test_errors_are_not_cached_without_error_ttl(self):
+        fetch = ttl_cache(ttl=60)(self.fetch)
+        for _ in range(2):
+            with self.assertRaises(ApiError):
+                await fetch("missing")
+        self.assertEqual(self.calls, 2)
+
+    async def test_concurrent_identical_calls_share_one_request(self):
+        fetch = ttl_cache(ttl=60)(self.fetch)
+        results = await asyncio.gather(*(fetch("a") for _ in range(5)))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_key_function_and_maxsize(self):
+        fetch = ttl_cache(ttl=60, maxsize=1, key=lambda name, **_: name.lower())(self.fetch)
+        await fetch("a")
+        await fetch("A")
+        self.assertEqual(self.calls, 1)
+
+        await fetch("b")
+        await fetch("a")
+        self.assertEqual(self.calls, 3)
+
+    async def test_disabled_skips_the_cache(self):
+        disabled = True
+        fetch = ttl_cache(ttl=60, disabled=lambda: disabled)(self.fetch)
+        await fetch("a")
+        await fetch("a")
+        self.assertEqual(self.calls, 2)
+
+        disabled = False
+        await fetch("a")
+        await fetch("a")
+        self.assertEqual(self.calls, 3)
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "done"
+
+        cancelled = asyncio.ensure_future(flight.run("key", slow))
+        waiting = asyncio.ensure_future(flight.run("key", slow))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await waiting, "done")
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(calls, 1)
+
+    async def test_call_is_forgotten_once_done(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def count():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        self.assertEqual(await flight.run("key", count), 1)
+        await asyncio.sleep(0)
+        self.assertEqual(await flight.run("key", count), 2)
+
+    async def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.001)
+            raise ApiError(500)
+
+        results = await asyncio.gather(flight.run("key", fail), flight.run("key", fail), return_exceptions=True)
+        self.assertIsInstance(results[0], ApiError)
+        self.assertIs(results[0], results[1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Tests for the Unipile request helper (zig/tools/unipile/config.py).
+"""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from zig.tests.fakes import FakeResponse, FakeSession
+from zig.tools.unipile import config
+
+class MakeRequestTest(unittest.IsolatedAsyncioTestCase):
+    async def request(self, session: FakeSession, method: str = 'GET'):
+        with patch.object(config, 'get_session', return_value=session):
+            return await config.make_request('https://unipile.test/api/v1/x', {'method': method})
+
+    async def test_retries_after_a_short_retry_after(self):
+        session = FakeSession(FakeResponse(429, headers={'Retry-After': '0'}), FakeResponse(200, b'{"ok": true}'))
+        self.assertEqual(await self.request(session, 'POST'), {'ok': True})
+        self.assertEqual(len(session.requests), 2)
+
+    async def test_fails_fast_when_retry_after_exceeds_the_cap(self):
+        session = FakeSession(FakeResponse(429, b'slow down', {'Retry-After': '3600'}), FakeResponse(200))
+        started = time.monotonic()
+        with self.assertRaises(config.UnipileError) as raised:
+            await self.request(session)
+        self.assertEqual(raised.exception.status, 429)
+        self.assertEqual(raised.exception.attempts, 1)
+        self.assertEqual(len(session.requests), 1)
+        self.assertLess(time.monotonic() - started, 1)
+
+    async def test_does_not_retry_client_errors(self):
+        session = FakeSession(FakeResponse(404, b'not found'))
+        with self.assertRaises(config.UnipileError) as raised:
+            await self.request(session)
+        self.assertEqual(raised.exception.status, 404)
+        self.assertEqual(config._limiter.in_flight, 0)
+
+    async def test_empty_body_parses_to_none(self):
+        self.assertIsNone(await self.request(FakeSession(FakeResponse(204, b''))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 # This file makes the python directory a Python package
 
-from .config import apollo_config, ApolloError
+from .config import apollo_config, ApolloError, close_session
 from .enrich import (
     people_enrichment,
     bulk_people_enrichment,
@@ -1,8 +1,19 @@
 import os
+import time
+import asyncio
+import aiohttp
+import orjson
+from typing import Any, Dict, Optional
+
+from ..http import AdaptiveConcurrencyLimiter, SharedSession, TokenBucket, backoff, retry_delay, ttl_cache
 
 apollo_config = {
     "apiKey": os.environ.get("APOLLO_API_KEY"),
     "endpoint": "https://api.apollo.io",
+    "rpm": int(os.environ.get("APOLLO_RPM", "300")),
+    "maxInFlight": int(os.environ.get("APOLLO_MAX_IN_FLIGHT", "32")),
+    "cacheDisabled": os.environ.get("APOLLO_CACHE_DISABLED", "").lower() in ("1", "true", "yes"),
+    "peopleBatchWindow": float(os.environ.get("APOLLO_PEOPLE_BATCH_WINDOW", "0")),
 }
 
 class ApolloError(Exception):
@@ -10,4 +21,145 @@ class ApolloError(Exception):
         self.status = status
         self.body = body
         super().__init__(message)
-        self.name = "ApolloError"
\ No newline at end of file
+        self.name = "ApolloError"
+
+# Default headers of the shared session, sent with every Apollo request
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Cache-Control": "no-cache",
+}
+
+# Shared HTTP session so every Apollo call reuses pooled keep-alive connections
+_session = SharedSession(lambda: aiohttp.ClientSession(
+    connector=aiohttp.TCPConnector(
+        limit=1024,
+        limit_per_host=64,
+        keepalive_timeout=75,
+        ttl_dns_cache=300
+    ),
+    timeout=aiohttp.ClientTimeout(total=30),
+    headers=_HEADERS
+))
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared aiohttp session used for Apollo requests.
+
+    The session is created lazily on first use (it must be created inside a running
+    event loop) and recreated if it has been closed.
+    """
+    return _session.get()
+
+async def close_session() -> None:
+    """
+    Closes the shared Apollo session, if one is open.
+    """
+    await _session.close()
+
+# Client-side pacing: requests per minute, and requests in flight at once
+_rate_limiter = TokenBucket(apollo_config["rpm"])
+# Halved whenever Apollo pushes back (429 or 5xx), grown by about half a request per round otherwise
+_in_flight = AdaptiveConcurrencyLimiter(apollo_config["maxInFlight"], increase=0.5, overload_rate=0.5)
+
+# Statuses of transient failures worth retrying, and how many attempts a request gets
+_RETRYABLE = {408, 425, 429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 5
+# Longest Retry-After honored; a longer one (e.g. an exhausted daily quota) fails the request
+MAX_RETRY_DELAY = 60.0
+
+def _observe_quota(response: aiohttp.ClientResponse) -> None:
+    """
+    Pauses the rate limiter when Apollo reports no requests left in the current minute.
+    """
+    remaining = response.headers.get("x-minute-requests-left") or response.headers.get("x-ratelimit-remaining-minute")
+    if remaining is not None and remaining.isdigit() and int(remaining) == 0:
+        # Wait out the rest of the current minute
+        _rate_limiter.pause(60 - time.time() % 60)
+
+async def make_request(
+    method: str,
+    path: str,
+    error_message: str,
+    json: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Makes an HTTP request to the Apollo API over the shared session.
+
+    Requests are paced to apollo_config["rpm"] per minute, and the number in flight
+    adapts between 1 and apollo_config["maxInFlight"] as Apollo accepts or throttles
+    them. Transient failures (the _RETRYABLE statuses, dropped connections and timeouts)
+    are retried up to MAX_ATTEMPTS times with jittered exponential backoff, honoring
+    Retry-After up to MAX_RETRY_DELAY seconds.
+
+    Args:
+        method (str): HTTP method (GET, POST, etc.).
+        path (str): The API path, relative to apollo_config["endpoint"].
+        error_message (str): The message attached to the ApolloError on failure.
+        json (Dict[str, Any], optional): The JSON request body.
+        params (Dict[str, Any], optional): The query string parameters.
+
+    Returns:
+        Any: The parsed JSON response.
+
+    Raises:
+        ApolloError: If the Apollo API returns an error, or is still failing the request
+            after MAX_ATTEMPTS attempts.
+    """
+    # Serialized once with orjson, and reused across retries
+    body = orjson.dumps(json) if json is not None else None
+    url = apollo_config["endpoint"] + path
+
+    for attempt in range(MAX_ATTEMPTS):
+        last_attempt = attempt == MAX_ATTEMPTS - 1
+        await _rate_limiter.acquire()
+        await _in_flight.acquire()
+        throttled = False
+        try:
+            async with get_session().request(
+                method,
+                url,
+                data=body,
+                params=params
+            ) as response:
+                _observe_quota(response)
+                throttled = response.status == 429 or response.status >= 500
+
+                if response.status < 400:
+                    return orjson.loads(await response.read())
+                delay = (
+                    retry_delay(response.headers.get("Retry-After"), attempt, MAX_RETRY_DELAY)
+                    if response.status in _RETRYABLE and not last_attempt else None
+                )
+                if delay is None:
+                    error_body = await response.text()
+                    raise ApolloError(response.status, error_body, error_message)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            # Dropped connections and timeouts are retried like a 5xx
+            throttled = True
+            if last_attempt:
+                raise
+            delay = backoff(attempt)
+        finally:
+            await _in_flight.release(throttled)
+
+        await asyncio.sleep(delay)
+
+# Responses cached per Apollo tool function
+RESPONSE_CACHE_SIZE = 256
+
+def cached_response(ttl: float = 600):
+    """
+    Caches the responses of an Apollo tool function for ttl seconds.
+
+    Calls are keyed by a hash of their normalized parameters, so repeated identical
+    queries within a session are answered without a network round-trip. Identical
+    calls made while one is already in flight wait for that call instead of issuing
+    their own request. Cached responses are shared between callers and must not be
+    mutated. Setting APOLLO_CACHE_DISABLED turns caching off (in-flight calls are
+    still shared).
+
+    Args:
+        ttl (float): How long a response stays valid, in seconds. Default is 600.
+    """
+    return ttl_cache(ttl, maxsize=RESPONSE_CACHE_SIZE, disabled=lambda: apollo_config["cacheDisabled"])
@@ -1,11 +1,132 @@
-from .config import apollo_config, ApolloError
-import json
-import requests
+from .config import apollo_config, ApolloError, make_request, cached_response
+from ..http import gather_bounded
+import asyncio
+import orjson
 from langchain_core.tools import tool
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+# Upper bound on concurrent single-record calls issued by a fan-out, to stay
+# within Apollo's rate limits
+FANOUT_CONCURRENCY = 10
+
+async def _match_person(params: Dict[str, Any]) -> Dict[str, Any]:
+    return await make_request(
+        "POST",
+        "/v1/people/match",
+        "Failed to fetch person enrichment data",
+        json={
+            "api_key": apollo_config["apiKey"],
+            **params
+        }
+    )
+
+# Single-person lookups that arrive within this many seconds of each other are sent
+# as one bulk_match request (Apollo accepts up to 10 people per call). Off (0) unless
+# APOLLO_PEOPLE_BATCH_WINDOW is set, since every lookup then waits out the window.
+PEOPLE_BATCH_WINDOW = apollo_config["peopleBatchWindow"]
+PEOPLE_BATCH_SIZE = 10
+
+# Fields that identify a person in a match request; every other parameter (e.g. the
+# reveal flags) applies to the whole bulk request
+_PERSON_DETAIL_KEYS = frozenset({
+    "first_name", "last_name", "name", "domain", "email", "hashed_email",
+    "organization_name", "linkedin_url", "id"
+})
+
+class _PersonMatchBatcher:
+    """
+    Coalesces concurrent single-person matches into bulk_match requests.
+
+    Pending lookups are grouped by their shared (non-identifying) parameters, since
+    those apply to every person in a bulk request. Every lookup resolves to
+    {"person": match}, whether it was sent alone or in a bulk request. If a bulk
+    request fails, its people are retried one by one, so a single bad entry only
+    fails its own lookup.
+    """
+    def __init__(self, window: float, size: int):
+        self.window = window
+        self.size = size
+        self.pending: Dict[bytes, Tuple[Dict[str, Any], List[Tuple[Dict[str, Any], asyncio.Future]]]] = {}
+        self.timers: Dict[bytes, asyncio.TimerHandle] = {}
+
+    async def submit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        details = {k: v for k, v in params.items() if k in _PERSON_DETAIL_KEYS}
+        shared = {k: v for k, v in params.items() if k not in _PERSON_DETAIL_KEYS}
+        key = orjson.dumps(shared, option=orjson.OPT_SORT_KEYS)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        _, batch = self.pending.setdefault(key, (shared, []))
+        batch.append((details, future))
+
+        if len(batch) >= self.size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self.timers[key] = loop.call_later(self.window, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: bytes) -> None:
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        shared, batch = self.pending.pop(key)
+        asyncio.ensure_future(self._send(shared, batch))
+
+    async def _send(self, shared: Dict[str, Any], batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        results: Optional[List[Any]] = None
+        if len(batch) > 1:
+            try:
+                response = await make_request(
+                    "POST",
+                    "/v1/people/bulk_match",
+                    "Failed to fetch person enrichment data",
+                    json={
+                        "api_key": apollo_config["apiKey"],
+                        **shared,
+                        "details": [details for details, _ in batch]
+                    }
+                )
+                matches = response.get("matches") or []
+                results = [matches[i] if i < len(matches) else None for i in range(len(batch))]
+            except Exception as error:
+                # A rejected request (e.g. one malformed entry) is retried person by
+                # person below; anything else fails every lookup of the batch
+                rejected = isinstance(error, ApolloError) and 400 <= error.status < 500 and error.status != 429
+                if not rejected:
+                    results = [error] * len(batch)
+
+        if results is None:
+            responses = await gather_bounded(_match_person, [{**shared, **details} for details, _ in batch], FANOUT_CONCURRENCY)
+            results = [
+                response if isinstance(response, Exception) else response.get("person")
+                for response in responses
+            ]
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result({"person": result})
+
+_person_batcher = _PersonMatchBatcher(PEOPLE_BATCH_WINDOW, PEOPLE_BATCH_SIZE)
+
+async def _enrich_organization(domain: str) -> Dict[str, Any]:
+    return await make_request(
+        "GET",
+        "/v1/organizations/enrich",
+        "Failed to fetch organization enrichment data",
+        params={
+            "api_key": apollo_config["apiKey"],
+            "domain": domain
+        }
+    )
 
 @tool
+@cached_response()
 async def people_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
     """Enriches data for a single person in the Apollo database.
 
@@ -23,39 +144,19 @@ async def people_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
             reveal_phone_number (bool, optional): Whether to reveal phone numbers. Default is False.
 
     Returns:
-        Dict[str, Any]: A dictionary containing the enriched person data.
+        Dict[str, Any]: A dictionary containing the enriched person data. When lookups
+            are batched (APOLLO_PEOPLE_BATCH_WINDOW), it only holds the "person" key.
 
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
-    api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
-    
-    response = requests.post(
-        f"{endpoint}/v1/people/match",
-        headers={
-            "Content-Type": "application/json",
-            "Cache-Control": "no-cache",
-        },
-        json={
-            "api_key": api_key,
-            **params
-        }
-    )
-    
-    if not response.ok:
-        error_body = response.text
-        raise ApolloError(
-            response.status_code,
-            error_body,
-            "Failed to fetch person enrichment data"
-        )
-    
-    raw_data = response.json()
-    return raw_data
+    if PEOPLE_BATCH_WINDOW <= 0:
+        return await _match_person(params)
+    return await _person_batcher.submit(params)
 
 @tool
-async def bulk_people_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
+@cached_response()
+async def bulk_people_enrichment(params: Dict[str, Any], mode: str = "bulk") -> Dict[str, Any]:
     """Enriches data for up to 10 people in a single API call.
 
     See https://docs.apollo.io/reference/bulk-people-enrichment
@@ -72,41 +173,45 @@ async def bulk_people_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
                 linkedin_url (str, optional): The LinkedIn profile URL of the person.
             reveal_personal_emails (bool, optional): Whether to reveal personal emails for all people in the request. Default is False.
             reveal_phone_number (bool, optional): Whether to reveal phone numbers for all people in the request. Default is False.
+        mode (str, optional): "bulk" sends a single bulk request. "fanout" issues one
+            enrichment request per person concurrently instead. Default is "bulk".
 
     Returns:
         Dict[str, Any]: A dictionary containing the enriched data for the people.
+            In "fanout" mode, "matches" holds None for people that could not be enriched.
 
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
+    if mode == "fanout":
+        shared = {k: v for k, v in params.items() if k != "details"}
+        results = await gather_bounded(
+            _match_person,
+            [{**shared, **details} for details in params.get("details", [])],
+            FANOUT_CONCURRENCY
+        )
+        return {
+            "matches": [
+                None if isinstance(result, Exception) else result.get("person")
+                for result in results
+            ]
+        }
+
     api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
-    
-    response = requests.post(
-        f"{endpoint}/v1/people/bulk_match",
-        headers={
-            "Content-Type": "application/json",
-            "Cache-Control": "no-cache",
-        },
+
+    return await make_request(
+        "POST",
+        "/v1/people/bulk_match",
+        "Failed to fetch bulk person enrichment data",
         json={
             "api_key": api_key,
             **params
         }
     )
-    
-    if not response.ok:
-        error_body = response.text
-        raise ApolloError(
-            response.status_code,
-            error_body,
-            "Failed to fetch bulk person enrichment data"
-        )
-    
-    raw_data = response.json()
-    return raw_data
 
 
 @tool
+@cached_response(ttl=3600)
 async def organization_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
     """Enriches data for a single organization in the Apollo database.
 
@@ -122,38 +227,11 @@ async def organization_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
-    api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
-    domain = params.get("domain")
-    
-    url = f"{endpoint}/v1/organizations/enrich"
-    params = {
-        "api_key": api_key,
-        "domain": domain
-    }
-    
-    response = requests.get(
-        url,
-        headers={
-            "Content-Type": "application/json",
-            "Cache-Control": "no-cache",
-        },
-        params=params
-    )
-    
-    if not response.ok:
-        error_body = response.text
-        raise ApolloError(
-            response.status_code,
-            error_body,
-            "Failed to fetch organization enrichment data"
-        )
-    
-    raw_data = response.json()
-    return raw_data
+    return await _enrich_organization(params.get("domain"))
 
 @tool
-async def bulk_organization_enrichment(params: Dict[str, Any]) -> Dict[str, Any]:
+@cached_response(ttl=3600)
+async def bulk_organization_enrichment(params: Dict[str, Any], mode: str = "bulk") -> Dict[str, Any]:
     """Enriches data for up to 10 organizations in a single API call.
 
     See https://docs.apollo.io/reference/bulk-organization-enrichment
@@ -161,36 +239,34 @@ async def bulk_organization_enrichment(params: Dict[str, Any]) -> Dict[str, Any]
     Args:
         params (Dict[str, Any]): The parameters for bulk enrichment. Possible keys:
             domains (List[str]): An array of domain names to enrich (up to 10).
+        mode (str, optional): "bulk" sends a single bulk request. "fanout" issues one
+            enrichment request per domain concurrently instead. Default is "bulk".
 
     Returns:
         Dict[str, Any]: A dictionary containing the enriched data for the organizations.
+            In "fanout" mode, "organizations" holds None for domains that could not be enriched.
 
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
     api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
     domains = params.get("domains", [])
-    
-    response = requests.post(
-        f"{endpoint}/v1/organizations/bulk_enrich",
-        headers={
-            "Content-Type": "application/json",
-            "Cache-Control": "no-cache",
-        },
+
+    if mode == "fanout":
+        results = await gather_bounded(_enrich_organization, domains, FANOUT_CONCURRENCY)
+        return {
+            "organizations": [
+                None if isinstance(result, Exception) else result.get("organization")
+                for result in results
+            ]
+        }
+
+    return await make_request(
+        "POST",
+        "/v1/organizations/bulk_enrich",
+        "Failed to fetch bulk organization enrichment data",
         json={
             "api_key": api_key,
             "domains": domains
         }
-    )
-    
-    if not response.ok:
-        error_body = response.text
-        raise ApolloError(
-            response.status_code,
-            error_body,
-            "Failed to fetch bulk organization enrichment data"
-        )
-    
-    raw_data = response.json()      
-    return raw_data
\ No newline at end of file
+    )
\ No newline at end of file
@@ -1,12 +1,13 @@
-from .config import apollo_config, ApolloError
-import aiohttp
+from .config import apollo_config, make_request, cached_response
 from langchain.tools import tool
 from .translation.search import extract_people_search_data, PeopleSearchData
 
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class PeopleSearchParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     person_titles: Optional[List[str]] = Field(default=None, description="Job titles held by the people you want to find")
     include_similar_titles: Optional[bool] = Field(default=True, description="Whether to include similar titles")
     person_locations: Optional[List[str]] = Field(default=None, description="The location where people live")
@@ -21,6 +22,31 @@ class PeopleSearchParams(BaseModel):
     per_page: Optional[int] = Field(default=10, description="The number of search results that should be returned for each page")
 
 
+@cached_response()
+async def fetch_people_search(params: PeopleSearchParams) -> Dict[str, Any]:
+    """Runs an Apollo people search and returns the response as returned by the API.
+
+    See https://docs.apollo.io/reference/people-search
+
+    Args:
+        params (PeopleSearchParams): The search parameters.
+
+    Returns:
+        Dict[str, Any]: The unprocessed Apollo response.
+
+    Raises:
+        ApolloError: If the Apollo API returns an error.
+    """
+    return await make_request(
+        "POST",
+        "/v1/mixed_people/search",
+        "Failed to fetch people search results",
+        json={
+            "api_key": apollo_config["apiKey"],
+            **params.model_dump(exclude_none=True)
+        }
+    )
+
 @tool
 async def people_search(params: PeopleSearchParams) -> List[PeopleSearchData]:
     """Searches for people in the Apollo database.
@@ -48,33 +74,15 @@ async def people_search(params: PeopleSearchParams) -> List[PeopleSearchData]:
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
-    api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
-
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f"{endpoint}/v1/mixed_people/search",
-            headers={
-                "Content-Type": "application/json",
-                "Cache-Control": "no-cache",
-            },
-            json={
-                "api_key": api_key,
-                **params.model_dump(exclude_none=True)
-            }
-        ) as response:
-            if response.status >= 400:
-                error_body = await response.text()
-                raise ApolloError(
-                    response.status,
-                    error_body,
-                    "Failed to fetch people search results"
-                )
-
-            raw_data = await response.json()
-            return extract_people_search_data(raw_data)
+    raw_data = await fetch_people_search(params)
+
+    people = raw_data.get("people")
+    if not people:
+        return []
+    return extract_people_search_data(raw_data)
 
 @tool
+@cached_response()
 async def organization_search(params: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Searches for organizations in the Apollo database.
 
@@ -96,33 +104,18 @@ async def organization_search(params: Dict[str, Any]) -> List[Dict[str, Any]]:
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
-    api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
-
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f"{endpoint}/v1/mixed_companies/search",
-            headers={
-                "Content-Type": "application/json",
-                "Cache-Control": "no-cache",
-            },
-            json={
-                "api_key": api_key,
-                **params
-            }
-        ) as response:
-            if response.status >= 400:
-                error_body = await response.text()
-                raise ApolloError(
-                    response.status,
-                    error_body,
-                    "Failed to fetch organization search results"
-                )
-
-            raw_data = await response.json()
-            return raw_data
+    return await make_request(
+        "POST",
+        "/v1/mixed_companies/search",
+        "Failed to fetch organization search results",
+        json={
+            "api_key": apollo_config["apiKey"],
+            **params
+        }
+    )
 
 @tool
+@cached_response(ttl=600)
 async def organization_job_postings(params: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Retrieves the current job postings for a company.
 
@@ -140,35 +133,17 @@ async def organization_job_postings(params: Dict[str, Any]) -> List[Dict[str, An
     Raises:
         ApolloError: If the Apollo API returns an error.
     """
-    api_key = apollo_config["apiKey"]
-    endpoint = apollo_config["endpoint"]
     organization_id = params.get("organization_id")
     page = params.get("page", 1)
     per_page = params.get("per_page", 10)
 
-    url = f"{endpoint}/v1/organizations/{organization_id}/job_postings"
-    request_params = {
-        "api_key": api_key,
-        "page": str(page),
-        "per_page": str(per_page)
-    }
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            url,
-            headers={
-                "Content-Type": "application/json",
-                "Cache-Control": "no-cache",
-            },
-            params=request_params
-        ) as response:
-            if response.status >= 400:
-                error_body = await response.text()
-                raise ApolloError(
-                    response.status,
-                    error_body,
-                    "Failed to fetch organization job postings"
-                )
-
-            raw_data = await response.json()
-            return raw_data
+    return await make_request(
+        "GET",
+        f"/v1/organizations/{organization_id}/job_postings",
+        "Failed to fetch organization job postings",
+        params={
+            "api_key": apollo_config["apiKey"],
+            "page": str(page),
+            "per_page": str(per_page)
+        }
+    )
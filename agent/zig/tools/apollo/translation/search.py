@@ -1,17 +1,57 @@
-import json
-from typing import Dict, List, Any, Optional
+import orjson
+from typing import Dict, List, Any, TypedDict
 
-from pydantic import BaseModel, Field
+class PeopleSearchData(TypedDict):
+    """
+    A person extracted from a peopleSearch response. Plain dicts of this shape are
+    stored in the agent state and sent to the UI as is.
+    """
+    first_name: str  # The first name of the person
+    last_name: str  # The last name of the person
+    linkedin_url: str  # The LinkedIn URL of the person
+    email_status: str  # The email status of the person
+    email: str  # The email of the person, or 'Unlock' if the email is not unlocked
+    title: str  # The title of the person
+    organization: str  # The organization of the person
+    location: str  # The location of the person
+
+# Apollo's placeholder for emails that have not been unlocked
+EMAIL_NOT_UNLOCKED = "email_not_unlocked@domain.com"
+
+def _extract_person(person: Dict[str, Any]) -> PeopleSearchData:
+    """
+    Extract the PeopleSearchData fields from a single person of a peopleSearch response.
+    """
+    get = person.get
+
+    # Handle email according to requirement
+    email = get("email", "")
+    if email == EMAIL_NOT_UNLOCKED:
+        email = "Unlock"
 
-class PeopleSearchData(BaseModel):
-    first_name: str = Field(description="The first name of the person")
-    last_name: str = Field(description="The last name of the person")
-    linkedin_url: str = Field(description="The LinkedIn URL of the person")
-    email_status: str = Field(description="The email status of the person")
-    email: str = Field(description="The email of the person, or 'Unlock' if the email is not unlocked")
-    title: str = Field(description="The title of the person")
-    organization: str = Field(description="The organization of the person")
-    location: str = Field(description="The location of the person")
+    # Get employment history information if available
+    title = organization = ""
+    employment_history = get("employment_history")
+    if employment_history:
+        employment = employment_history[0]
+        title = employment.get("title", "")
+        organization = employment.get("organization_name", "")
+
+    # Format location
+    city = get("city", "")
+    state = get("state", "")
+    location = ", ".join(filter(None, (city, state)))
+
+    return {
+        "first_name": get("first_name", ""),
+        "last_name": get("last_name", ""),
+        "linkedin_url": get("linkedin_url", ""),
+        "email_status": get("email_status", ""),
+        "email": email,
+        "title": title,
+        "organization": organization,
+        "location": location
+    }
 
 def extract_people_search_data(data: Dict[str, Any]) -> List[PeopleSearchData]:
     """
@@ -30,47 +70,7 @@ def extract_people_search_data(data: Dict[str, Any]) -> List[PeopleSearchData]:
     Returns:
         List of dictionaries with extracted fields for each person
     """
-    result = []
-    
-    for person in data.get("people", []):
-        # Extract basic information
-        first_name = person.get("first_name", "")
-        last_name = person.get("last_name", "")
-        linkedin_url = person.get("linkedin_url", "")
-        email_status = person.get("email_status", "")
-        
-        # Handle email according to requirement
-        email = person.get("email", "")
-        if email == "email_not_unlocked@domain.com":
-            email = "Unlock"
-            
-        # Get employment history information if available
-        employment_info = {"title": "", "organization": ""}
-        if person.get("employment_history") and len(person["employment_history"]) > 0:
-            employment = person["employment_history"][0]
-            employment_info["title"] = employment.get("title", "")
-            employment_info["organization"] = employment.get("organization_name", "")
-            
-        # Format location
-        city = person.get("city", "")
-        state = person.get("state", "")
-        location = f"{city}, {state}" if city and state else city or state or ""
-        
-        # Create person entry
-        person_data = {
-            "first_name": first_name,
-            "last_name": last_name,
-            "linkedin_url": linkedin_url,
-            "email_status": email_status,
-            "email": email,
-            "title": employment_info["title"],
-            "organization": employment_info["organization"],
-            "location": location
-        }
-        
-        result.append(person_data)
-        
-    return result
+    return [_extract_person(person) for person in data.get("people", [])]
 
 
 def test_extract_people_search_data(file_path: str) -> List[Dict[str, Any]]:
@@ -83,8 +83,8 @@ def test_extract_people_search_data(file_path: str) -> List[Dict[str, Any]]:
     Returns:
         Extracted data
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    with open(file_path, 'rb') as f:
+        data = orjson.loads(f.read())
     
     return extract_people_search_data(data)
 
@@ -0,0 +1,343 @@
+"""
+Shared HTTP client primitives
+
+This file contains the request pacing, adaptive concurrency, retry, caching and
+session helpers shared by the Apollo and Unipile API clients.
+"""
+
+import time
+import asyncio
+import random
+import hashlib
+import aiohttp
+import orjson
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+# asyncio primitives bind to the first event loop that waits on them, so module-level
+# limiters create theirs lazily, once per loop (e.g. per asyncio.run)
+class _PerLoop:
+    """
+    Holds an object built by `factory` for the running event loop, rebuilt when used
+    from another loop.
+    """
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._value: Any = None
+
+    def get(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._value = self.factory()
+        return self._value
+
+# Request rate control
+class TokenBucket:
+    """
+    Paces calls to at most `rate` per `period` seconds, allowing short bursts of up to
+    `rate` calls (at least one) when the bucket is full. Fractional rates are allowed,
+    e.g. 0.5 per minute paces calls two minutes apart.
+
+    Raises:
+        ValueError: If rate is not positive.
+    """
+    def __init__(self, rate: float, period: float = 60.0):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        # A full bucket must hold a whole token, or acquire() could never take one
+        self.capacity = max(1.0, rate)
+        self.fill_rate = rate / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = _PerLoop(asyncio.Lock)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every call for the next `seconds`, e.g. when the API reports the quota
+        is exhausted.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and takes it.
+        """
+        async with self._lock.get():
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+
+# Adaptive concurrency control
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of requests in flight, adapting the limit with AIMD.
+
+    Every successful request grows the limit by about `increase` per round of requests,
+    up to max_concurrency. Every overloaded request (the API pushed back, e.g. with a
+    429) shrinks it by overload_rate, down to a single request at a time.
+    """
+    def __init__(self, max_concurrency: int = 100, increase: float = 1.0, overload_rate: float = 0.1):
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.overload_rate = overload_rate
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._changed = _PerLoop(asyncio.Condition)
+
+    async def acquire(self) -> None:
+        changed = self._changed.get()
+        async with changed:
+            await changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, overloaded: bool) -> None:
+        changed = self._changed.get()
+        async with changed:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(1.0, self.limit * (1 - self.overload_rate))
+            else:
+                self.limit = min(self.max_concurrency, self.limit + self.increase / self.limit)
+            changed.notify_all()
+
+# Retry delays
+def backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Full-jitter exponential backoff: a random delay of up to base * 2 ** attempt
+    seconds, capped at `cap`.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header, either delay-seconds or an HTTP-date, into the number
+    of seconds to wait (never negative).
+
+    Returns:
+        Optional[float]: The delay, or None if the header is missing or malformed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def retry_delay(retry_after: Optional[str], attempt: int, max_delay: float) -> Optional[float]:
+    """
+    Seconds to wait before retrying a failed request: the Retry-After header when the
+    API sends one, full-jitter exponential backoff otherwise.
+
+    Args:
+        retry_after (Optional[str]): The response's Retry-After header, if any.
+        attempt (int): The number of the failed attempt, from 0.
+        max_delay (float): The longest Retry-After honored, in seconds.
+
+    Returns:
+        Optional[float]: The delay, or None when Retry-After asks for more than
+            max_delay (e.g. an exhausted daily quota), i.e. the request should fail
+            rather than be retried.
+    """
+    delay = parse_retry_after(retry_after)
+    if delay is None:
+        return backoff(attempt)
+    return delay if delay <= max_delay else None
+
+# Shared HTTP session
+class SharedSession:
+    """
+    Holds an aiohttp session shared by every call of a client, so they reuse pooled
+    keep-alive connections.
+
+    The session is built by `factory` on first use (it must be created inside a running
+    event loop) and rebuilt if it has been closed or the event loop has changed (e.g. a
+    later asyncio.run), since a session only works on the loop it was created on.
+    """
+    def __init__(self, factory: Callable[[], aiohttp.ClientSession]):
+        self.factory = factory
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = self.factory()
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        # A session left on a finished loop cannot be closed from this one; it is dropped
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+# In-flight call coalescing
+class SingleFlight:
+    """
+    Shares one call between concurrent callers asking for the same key: while a call
+    is in flight, identical calls wait for its result instead of making their own.
+    The result is shared between callers and must not be mutated.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        # A call left over from a finished event loop can never complete on this one
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded so that a cancelled caller does not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        # Only if it has not been replaced by a newer call since
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+# Helper to run several requests concurrently
+async def gather_bounded(
+    fn: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    concurrency: int = 10
+) -> List[Any]:
+    """
+    Calls fn for every item concurrently, with at most `concurrency` calls in flight.
+
+    Results are returned in input order. A failed call yields its exception instead of
+    aborting the whole batch.
+
+    Args:
+        fn (Callable[[Any], Awaitable[Any]]): The coroutine function to call per item.
+        items (Iterable[Any]): The items to call fn with.
+        concurrency (int): The maximum number of concurrent calls. Defaults to 10.
+
+    Returns:
+        List[Any]: The result (or exception) of each call.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item):
+        async with semaphore:
+            return await fn(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+# Helper to cache the responses of read-only endpoints
+def _serialize_param(value: Any) -> Any:
+    # Pydantic parameter models are keyed by their request payload
+    return value.model_dump(exclude_none=True)
+
+def hashed_key(*args: Any, **kwargs: Any) -> bytes:
+    """
+    Default cache key: a hash of the call's normalized arguments.
+    """
+    payload = orjson.dumps([args, kwargs], default=_serialize_param, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def _is_client_error(error: Exception) -> bool:
+    # 4xx API errors other than 429, e.g. a record that does not exist
+    status = getattr(error, 'status', None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+def ttl_cache(
+    ttl: float,
+    maxsize: int = 1024,
+    key: Optional[Callable[..., Hashable]] = None,
+    error_ttl: Optional[float] = None,
+    disabled: Optional[Callable[[], bool]] = None
+):
+    """
+    Caches the responses of an async API function for ttl seconds.
+
+    Each decorated function gets its own LRU cache of at most maxsize entries. Calls
+    are keyed by a hash of their arguments, or by key(*args, **kwargs) when a key
+    function is given. Identical calls made while one is already in flight wait for
+    that call instead of issuing their own request. A call made with
+    force_refresh=True skips the cache lookup and stores the fresh response. Cached
+    responses are shared between callers and must not be mutated. When error_ttl is
+    given, client errors (4xx errors other than 429, e.g. a profile that does not
+    exist) are cached too, for error_ttl seconds, and raised again on a hit.
+
+    Args:
+        ttl (float): How long a response stays valid, in seconds.
+        maxsize (int): The maximum number of cached responses. Defaults to 1024.
+        key (Optional[Callable[..., Hashable]]): Builds the cache key from the call's
+            arguments (force_refresh excluded). Defaults to hashed_key.
+        error_ttl (Optional[float]): How long a client error stays cached, in seconds.
+            Defaults to not caching errors.
+        disabled (Optional[Callable[[], bool]]): Checked on every call; while it
+            returns True the cache is skipped (in-flight calls are still shared).
+
+    Example:
+        ```python
+        @ttl_cache(ttl=3600, key=lambda keywords, **_: keywords.lower())
+        async def search(keywords: str, force_refresh: bool = False) -> Any:
+            ...
+        ```
+    """
+    make_key = key or hashed_key
+
+    def decorator(func):
+        cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        inflight = SingleFlight()
+
+        def store(cache_key: Hashable, expires: float, result: Any, error: Optional[Exception]) -> None:
+            cache[cache_key] = (expires, result, error)
+            cache.move_to_end(cache_key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        async def call(cache_key: Hashable, use_cache: bool, args, kwargs) -> Any:
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as error:
+                if use_cache and error_ttl is not None and _is_client_error(error):
+                    store(cache_key, time.monotonic() + error_ttl, None, error)
+                raise
+            if use_cache:
+                store(cache_key, time.monotonic() + ttl, result, None)
+            return result
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            force_refresh = kwargs.get('force_refresh', False)
+            key_kwargs = {k: v for k, v in kwargs.items() if k != 'force_refresh'}
+            cache_key = make_key(*args, **key_kwargs)
+            use_cache = disabled is None or not disabled()
+
+            if use_cache and not force_refresh:
+                entry = cache.get(cache_key)
+                if entry is not None and entry[0] > time.monotonic():
+                    cache.move_to_end(cache_key)
+                    if entry[2] is not None:
+                        raise entry[2]
+                    return entry[1]
+
+            return await inflight.run(cache_key, lambda: call(cache_key, use_cache, args, kwargs))
+        return wrapper
+    return decorator
@@ -2,19 +2,97 @@
 Unipile API Client
 
 This file exports all the functions for interacting with the Unipile API.
+
+Submodules are imported lazily, the first time one of their names is accessed
+(PEP 562), so importing the package does not load every tool module.
 """
 
-# Export configuration
-from .config import *
+import importlib
+from typing import Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    # Configuration
+    "UNIPILE_DSN": "config",
+    "UNIPILE_API_KEY": "config",
+    "UNIPILE_ACCOUNT_ID": "config",
+    "get_base_url": "config",
+    "get_headers": "config",
+    "UnipileError": "config",
+    "get_session": "config",
+    "close_session": "config",
+    "make_request": "config",
+    "PaginatedResponse": "config",
+    "AccountInfo": "config",
+    "ensure_account_id": "config",
+    "ttl_cache": "config",
+    "gather_bounded": "config",
+    "iter_pages": "config",
+    "require": "config",
+
+    # User-related functions
+    "LinkedInUserProfile": "users",
+    "LinkedInAccountOwnerProfile": "users",
+    "LinkedInUserRelation": "users",
+    "LinkedInInvitation": "users",
+    "LinkedInSearchResult": "users",
+    "LinkedInSearchResponse": "users",
+    "get_account_owner_profile": "users",
+    "get_user_profile_by_identifier": "users",
+    "get_user_profiles": "users",
+    "search_linkedin": "users",
+    "get_relations": "users",
+    "get_invitations_sent": "users",
+    "get_invitations_received": "users",
+    "send_invitation": "users",
+    "iter_relations": "users",
+    "iter_invitations_sent": "users",
+    "iter_invitations_received": "users",
+
+    # Post-related functions
+    "LinkedInPostAuthor": "posts",
+    "LinkedInPostAttachment": "posts",
+    "LinkedInPost": "posts",
+    "LinkedInComment": "posts",
+    "get_user_posts": "posts",
+    "get_user_comments": "posts",
+    "create_post": "posts",
+    "get_post": "posts",
+    "get_post_comments": "posts",
+    "comment_on_post": "posts",
+    "get_user_posts_bulk": "posts",
+    "get_post_bulk": "posts",
+    "get_post_comments_bulk": "posts",
+    "iter_user_posts": "posts",
+    "iter_user_comments": "posts",
+    "iter_post_comments": "posts",
+
+    # Message-related functions
+    "LinkedInChat": "messages",
+    "LinkedInMessage": "messages",
+    "LinkedInMessageAttachment": "messages",
+    "get_chats": "messages",
+    "get_chat_messages": "messages",
+    "iter_chat_messages": "messages",
+    "send_message": "messages",
+    "create_chat": "messages",
 
-# Export user-related functions
-from .users import *
+    # Company-related functions
+    "get_company_profile": "companies",
+    "get_company_profiles": "companies",
+    "search_companies": "companies",
+}
 
-# Export post-related functions
-from .posts import *
+__all__ = list(_EXPORTS)
 
-# Export message-related functions
-from .messages import *
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
 
-# Export company-related functions
-from .companies import *
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
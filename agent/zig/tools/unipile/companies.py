@@ -3,11 +3,16 @@ Unipile API - LinkedIn Companies
 
 This file contains functions for interacting with LinkedIn companies via the Unipile API.
 """
-import json
+import orjson
+from urllib.parse import quote
 from typing import List, Dict, Any, Optional
-from .config import get_base_url, get_headers, make_request, ensure_account_id
+from .config import get_base_url, get_headers, make_request, ensure_account_id, ttl_cache, gather_bounded, require, search_limiter
 from langchain_core.tools import tool
 
+# API paths, relative to the base URL
+COMPANY_PROFILE_PATH = "/api/v1/linkedin/company/{identifier}"
+SEARCH_PATH = "/api/v1/linkedin/search"
+
 # Types
 # class LinkedInCompanyLocation:
 #     is_headquarter: bool
@@ -36,9 +41,12 @@ from langchain_core.tools import tool
 #     logo_large: Optional[str]
 
 @tool
+@ttl_cache(ttl=86400)
+@require('identifier')
 async def get_company_profile(
     identifier: str,
-    account_id: Optional[str] = None
+    account_id: Optional[str] = None,
+    force_refresh: bool = False
 ) -> Any:
     """Retrieves detailed information about a LinkedIn company profile using the company's identifier.
 
@@ -53,32 +61,64 @@ async def get_company_profile(
                          their unique provider ID.
         account_id (Optional[str]): The Unipile account ID to use for this request. If not provided, 
                                    the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        force_refresh (bool): Fetch the profile from the API even if a cached copy (kept for
+                             up to a day) is available. Defaults to False.
 
     Returns:
         Any: The raw API response containing the company profile information.
 
     Raises:
-        Exception: If the company identifier is not provided or if there's an API error.
+        ValueError: If the company identifier is not provided.
+        Exception: If there's an API error.
     """
-    if not identifier:
-        raise Exception('Company identifier is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/linkedin/company/{identifier}?account_id={id_to_use}"
+    url = get_base_url() + COMPANY_PROFILE_PATH.format(identifier=quote(identifier, safe=''))
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': {'account_id': id_to_use}
     })
     
     return response
 
 
+async def get_company_profiles(
+    identifiers: List[str],
+    account_id: Optional[str] = None,
+    concurrency: int = 10
+) -> List[Any]:
+    """Retrieves several LinkedIn company profiles concurrently.
+
+    Each profile is fetched with get_company_profile (and so shares its cache), with at
+    most `concurrency` requests in flight at once.
+
+    Args:
+        identifiers (List[str]): The LinkedIn company identifiers to look up.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        concurrency (int): The maximum number of concurrent requests. Defaults to 10.
+
+    Returns:
+        List[Any]: The company profile for each identifier, in order. Lookups that failed
+                   hold the raised exception instead.
+    """
+    return await gather_bounded(
+        lambda identifier: get_company_profile.ainvoke({'identifier': identifier, 'account_id': account_id}),
+        identifiers,
+        concurrency
+    )
+
+@ttl_cache(
+    ttl=3600,
+    key=lambda keywords, account_id=None, limit=None: ((keywords or '').lower().strip(), limit, account_id)
+)
+@require('keywords')
 async def search_companies(
     keywords: str,
     account_id: Optional[str] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    force_refresh: bool = False
 ) -> Any:
     """Searches for LinkedIn companies based on provided keywords.
 
@@ -94,24 +134,25 @@ async def search_companies(
         account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
                                    the function will use the UNIPILE_ACCOUNT_ID environment variable.
         limit (Optional[int]): Maximum number of search results to return. Defaults to 10 if not specified.
+        force_refresh (bool): Run the search even if cached results (kept for up to an hour)
+                             are available. Defaults to False.
 
     Returns:
         Any: The raw API response containing a list of company objects matching the search criteria.
 
     Raises:
-        Exception: If no search keywords are provided or if there's an API error.
+        ValueError: If no search keywords are provided.
+        Exception: If there's an API error.
     """
-    if not keywords:
-        raise Exception('Search keywords are required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/linkedin/search?account_id={id_to_use}"
+    url = get_base_url() + SEARCH_PATH
     
+    await search_limiter.acquire()
     response = await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps({
+        'params': {'account_id': id_to_use},
+        'body': orjson.dumps({
             'api': 'classic',
             'category': 'companies',
             'keywords': keywords,
@@ -5,14 +5,34 @@ This file contains the configuration for the Unipile API client.
 """
 
 import os
-import json
-from typing import Dict, TypeVar, Generic, List, Any, Optional
+import asyncio
+import inspect
+import aiohttp
+import orjson
+from functools import wraps
+from types import MappingProxyType
+from typing import AsyncIterator, Awaitable, Callable, Dict, Mapping, TypeVar, Generic, List, Any, Optional
+
+from ..http import (
+    AdaptiveConcurrencyLimiter,
+    SharedSession,
+    SingleFlight,
+    TokenBucket,
+    backoff,
+    gather_bounded,
+    retry_delay,
+    ttl_cache
+)
 
 # Environment variables
 UNIPILE_DSN = os.environ.get('UNIPILE_DNS', '')
 UNIPILE_API_KEY = os.environ.get('UNIPILE_API_KEY', '')
 UNIPILE_ACCOUNT_ID = os.environ.get('UNIPILE_ACCOUNT_ID', '')
 
+# Base URL and request headers, computed once on first use
+_base_url: Optional[str] = None
+_headers: Optional[Mapping[str, str]] = None
+
 # Base URL
 def get_base_url() -> str:
     """
@@ -20,6 +40,7 @@ def get_base_url() -> str:
     
     This function returns the base URL for making API requests to Unipile, using the
     UNIPILE_DNS environment variable. It ensures the URL has the proper HTTP/HTTPS prefix.
+    The URL is computed on the first call and reused afterwards.
     
     Returns:
         str: The complete base URL for the Unipile API.
@@ -27,21 +48,24 @@ def get_base_url() -> str:
     Raises:
         Exception: If the UNIPILE_DNS environment variable is not set.
     """
-    if not UNIPILE_DSN:
-        raise Exception('UNIPILE_DNS environment variable is not set')
-    return UNIPILE_DSN if UNIPILE_DSN.startswith('http') else f"https://{UNIPILE_DSN}"
+    global _base_url
+    if _base_url is None:
+        if not UNIPILE_DSN:
+            raise Exception('UNIPILE_DNS environment variable is not set')
+        _base_url = UNIPILE_DSN if UNIPILE_DSN.startswith('http') else f"https://{UNIPILE_DSN}"
+    return _base_url
 
 # Common request headers
-def get_headers() -> Dict[str, str]:
+def get_headers() -> Mapping[str, str]:
     """
-    Generates the standard HTTP headers required for Unipile API requests.
+    Returns the standard HTTP headers required for Unipile API requests.
     
-    This function creates a dictionary of HTTP headers that should be included with
-    all requests to the Unipile API. It includes content type specifications and
-    the API key for authentication.
+    These headers should be included with all requests to the Unipile API. They include
+    content type specifications and the API key for authentication. The headers are
+    built on the first call and the same read-only mapping is returned afterwards.
     
     Returns:
-        Dict[str, str]: A dictionary of HTTP headers including:
+        Mapping[str, str]: A read-only mapping of HTTP headers including:
             - accept: application/json
             - content-type: application/json
             - X-API-KEY: The API key from environment variables
@@ -49,38 +73,114 @@ def get_headers() -> Dict[str, str]:
     Raises:
         Exception: If the UNIPILE_API_KEY environment variable is not set.
     """
-    if not UNIPILE_API_KEY:
-        raise Exception('UNIPILE_API_KEY environment variable is not set')
-    
-    return {
-        'accept': 'application/json',
-        'content-type': 'application/json',
-        'X-API-KEY': UNIPILE_API_KEY
-    }
+    global _headers
+    if _headers is None:
+        if not UNIPILE_API_KEY:
+            raise Exception('UNIPILE_API_KEY environment variable is not set')
+        _headers = MappingProxyType({
+            'accept': 'application/json',
+            'content-type': 'application/json',
+            'X-API-KEY': UNIPILE_API_KEY
+        })
+    return _headers
 
 # Error handling
 class UnipileError(Exception):
-    def __init__(self, status: int, body: str, message: Optional[str] = None):
+    def __init__(self, status: int, body: str, message: Optional[str] = None, attempts: int = 1):
         super().__init__(message or f"Unipile API error: {status}")
         self.status = status
         self.body = body
         self.name = 'UnipileError'
+        self.attempts = attempts
+
+# Shared HTTP session so every Unipile call reuses pooled keep-alive connections
+_session = SharedSession(lambda: aiohttp.ClientSession(
+    connector=aiohttp.TCPConnector(
+        limit=int(os.environ.get('UNIPILE_MAX_CONNECTIONS', '100')),
+        limit_per_host=int(os.environ.get('UNIPILE_MAX_PER_HOST', '20')),
+        keepalive_timeout=60,
+        ttl_dns_cache=300
+    ),
+    # Fail fast on unreachable hosts rather than spending the whole budget connecting
+    timeout=aiohttp.ClientTimeout(total=30, connect=5)
+))
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared aiohttp session used for Unipile requests.
+
+    The session is created lazily on first use (it must be created inside a running
+    event loop) and recreated if it has been closed. The connection pool is sized by
+    the UNIPILE_MAX_CONNECTIONS and UNIPILE_MAX_PER_HOST environment variables.
+
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    return _session.get()
+
+async def close_session() -> None:
+    """
+    Closes the shared Unipile session, if one is open.
+    """
+    await _session.close()
+
+# Adaptive concurrency control: the limit shrinks by 10% on every overloaded response
+# (429, 503) and grows by about one request per round otherwise
+_limiter = AdaptiveConcurrencyLimiter(int(os.environ.get('UNIPILE_MAX_CONCURRENCY', '100')))
+
+# One budget shared by every Unipile call: UNIPILE_RPM requests per minute
+_rate_limiter = TokenBucket(float(os.environ.get('UNIPILE_RPM', '60')))
+
+# LinkedIn restricts accounts that run searches too quickly, so every call to the
+# search endpoint (people and companies alike) is paced on its own budget of
+# UNIPILE_SEARCH_RPM per minute, on top of UNIPILE_RPM
+search_limiter = TokenBucket(float(os.environ.get('UNIPILE_SEARCH_RPM', '30')))
+
+# Retry policy: transient failures are retried with full-jitter exponential backoff.
+# GET requests are retried on overload and gateway errors, dropped connections and
+# timeouts; other methods only on 429 and failed connections, which mean the request
+# was rejected before being processed.
+_OVERLOAD_STATUSES = {429, 503}
+_IDEMPOTENT_RETRY_STATUSES = {429, 502, 503, 504}
+_NON_IDEMPOTENT_RETRY_STATUSES = {429}
+MAX_ATTEMPTS = 5
+# Longest Retry-After honored; a longer one (e.g. an exhausted daily quota) fails the request
+MAX_RETRY_DELAY = 60.0
+
+def _is_retryable_error(error: Exception, method: str) -> bool:
+    """
+    Whether a request that failed without a response can be retried: any client error
+    or timeout for GET requests, only connection failures (nothing was sent) for
+    other methods.
+    """
+    if method == 'GET':
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+    return isinstance(error, aiohttp.ClientConnectorError)
 
 # Helper function to make API requests
 T = TypeVar('T')
 
+# GET requests currently in flight, keyed by URL and query parameters
+_inflight = SingleFlight()
+
 async def make_request(url: str, options: Dict[str, Any]) -> T:
     """
     Makes an HTTP request to the Unipile API with error handling.
     
     This function is a wrapper around HTTP requests to the Unipile API that handles
     common error cases and provides a consistent interface for all API calls.
+    Requests (including retries) are paced to UNIPILE_RPM per minute across all
+    callers, concurrency adapts to the API's load, and transient failures are retried up to
+    MAX_ATTEMPTS times, honoring Retry-After up to MAX_RETRY_DELAY seconds (a longer one
+    fails the request). Identical GET requests made while one is already in flight share
+    its response, which must therefore not be mutated.
     
     Args:
         url (str): The complete URL for the API endpoint to call.
         options (Dict[str, Any]): A dictionary of request options including:
             - method (str): HTTP method (GET, POST, etc.). Defaults to 'GET'.
             - headers (Dict[str, str]): HTTP headers to include in the request.
+            - params (Dict[str, Any]): Query string parameters, URL-encoded by aiohttp.
             - body (str): Request body for POST/PUT requests, typically JSON-encoded.
     
     Returns:
@@ -101,25 +201,121 @@ async def make_request(url: str, options: Dict[str, Any]) -> T:
         )
         ```
     """
+    method = options.get('method', 'GET')
+    if method != 'GET':
+        return await _send_request(url, method, options)
+    
+    params = options.get('params')
+    key = (url, tuple(sorted(params.items())) if params else ())
+    return await _inflight.run(key, lambda: _send_request(url, method, options))
+
+async def _send_request(url: str, method: str, options: Dict[str, Any]) -> Any:
+    retry_statuses = _IDEMPOTENT_RETRY_STATUSES if method == 'GET' else _NON_IDEMPOTENT_RETRY_STATUSES
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method=options.get('method', 'GET'),
-                url=url,
-                headers=options.get('headers', {}),
-                data=options.get('body')
-            ) as response:
-                if not response.ok:
-                    error_text = await response.text()
-                    raise UnipileError(response.status, error_text)
-                
-                return await response.json()
+        for attempt in range(MAX_ATTEMPTS):
+            await _rate_limiter.acquire()
+            await _limiter.acquire()
+            overloaded = False
+            try:
+                async with get_session().request(
+                    method=method,
+                    url=url,
+                    headers=options.get('headers', {}),
+                    params=options.get('params'),
+                    data=options.get('body')
+                ) as response:
+                    if response.ok:
+                        # Empty bodies (e.g. 204 No Content) parse to None, like response.json()
+                        body = await response.read()
+                        return orjson.loads(body) if body.strip() else None
+                    
+                    overloaded = response.status in _OVERLOAD_STATUSES
+                    delay = (
+                        retry_delay(response.headers.get('Retry-After'), attempt, MAX_RETRY_DELAY)
+                        if response.status in retry_statuses and attempt < MAX_ATTEMPTS - 1 else None
+                    )
+                    if delay is None:
+                        error_text = await response.text()
+                        raise UnipileError(response.status, error_text, attempts=attempt + 1)
+            except Exception as error:
+                if isinstance(error, UnipileError) or not _is_retryable_error(error, method) or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                # Dropped connections and timeouts count as overload
+                overloaded = True
+                delay = backoff(attempt)
+            finally:
+                await _limiter.release(overloaded)
+            
+            await asyncio.sleep(delay)
     except UnipileError:
         raise
     except Exception as error:
         raise Exception(f"Failed to make request: {str(error)}")
 
+# Helper to validate required arguments
+def require(*names: str):
+    """
+    Rejects calls of an async Unipile function where any of the named arguments is
+    missing or empty, before any request is made.
+
+    Raises ValueError, which make_request's callers can tell apart from API and
+    network failures.
+
+    Args:
+        *names (str): The names of the required arguments.
+
+    Example:
+        ```python
+        @require('post_id', 'text')
+        async def comment_on_post(post_id: str, text: str) -> Any:
+            ...
+        ```
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs).arguments
+            for name in names:
+                if not arguments.get(name):
+                    raise ValueError(f"{name} is required")
+            return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Helper to walk cursor-paginated endpoints
+async def iter_pages(fetch: Callable[[Optional[str]], Awaitable[Any]]) -> AsyncIterator[Any]:
+    """
+    Yields the items of every page of a cursor-paginated endpoint.
+
+    fetch(cursor) is called with None for the first page, then with the cursor of each
+    response until a response has no cursor. The next page is requested before the
+    items of the current one are yielded, so its round-trip overlaps with the
+    caller's processing.
+
+    Args:
+        fetch (Callable[[Optional[str]], Awaitable[Any]]): Fetches the page at the given cursor.
+
+    Yields:
+        Any: The items of each page, in order.
+    """
+    page = await fetch(None)
+    next_page: Optional["asyncio.Task[Any]"] = None
+    try:
+        while True:
+            cursor = page.get('cursor')
+            next_page = asyncio.ensure_future(fetch(cursor)) if cursor else None
+            for item in page.get('items') or ():
+                yield item
+            if next_page is None:
+                return
+            page = await next_page
+    finally:
+        # The caller stopped early: drop the prefetched page
+        if next_page is not None and not next_page.done():
+            next_page.cancel()
+
 # Types
 class PaginatedResponse(Generic[T]):
     items: List[T]
@@ -127,14 +323,23 @@ class PaginatedResponse(Generic[T]):
     object: Optional[str] = None
 
 class AccountInfo:
+    __slots__ = ('id', 'provider', 'extra')
+
     id: str
     provider: str
     
-    def __init__(self, **kwargs):
-        self.id = kwargs.get('id')
-        self.provider = kwargs.get('provider')
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+    def __init__(self, id: Optional[str] = None, provider: Optional[str] = None, **extra: Any):
+        self.id = id
+        self.provider = provider
+        self.extra = extra
+
+    def __getattr__(self, name: str) -> Any:
+        # Any other account fields are exposed as attributes, read from extra
+        if name != 'extra':
+            extra = self.extra
+            if name in extra:
+                return extra[name]
+        raise AttributeError(name)
 
 # Helper function to ensure account_id is provided
 def ensure_account_id(account_id: Optional[str] = None) -> str:
@@ -4,12 +4,19 @@ Unipile API - LinkedIn Messages
 This file contains functions for interacting with LinkedIn messages via the Unipile API.
 """
 
-import json
-from typing import List, Dict, Any, Optional, Union
-from .config import get_base_url, get_headers, make_request, ensure_account_id, PaginatedResponse
+import orjson
+from dataclasses import dataclass
+from urllib.parse import quote
+from typing import AsyncIterator, List, Dict, Any, Optional, Union
+from .config import get_base_url, get_headers, make_request, ensure_account_id, iter_pages, PaginatedResponse, require
 from langchain_core.tools import tool
 
+# API paths, relative to the base URL
+CHATS_PATH = "/api/v1/chats"
+CHAT_MESSAGES_PATH = "/api/v1/chats/{chat_id}/messages"
+
 # Types
+@dataclass(slots=True, frozen=True)
 class LinkedInChat:
     object: str
     name: Optional[str]
@@ -28,6 +35,7 @@ class LinkedInChat:
     attendee_provider_id: str
     id: str
 
+@dataclass(slots=True, frozen=True)
 class LinkedInMessage:
     object: str
     seen: int
@@ -56,6 +64,7 @@ class LinkedInMessage:
     sender_attendee_id: str
     id: str
 
+@dataclass(slots=True, frozen=True)
 class LinkedInMessageAttachment:
     type: str
     url: str
@@ -93,22 +102,24 @@ async def get_chats(
         Exception: If there's an API error during the request.
     """
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/chats?account_id={id_to_use}"
+    url = get_base_url() + CHATS_PATH
+    params: Dict[str, Any] = {'account_id': id_to_use}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
     return response
 
 @tool
+@require('chat_id')
 async def get_chat_messages(
     chat_id: str,
     account_id: Optional[str] = None,
@@ -136,28 +147,55 @@ async def get_chat_messages(
         Any: The raw API response containing a paginated list of LinkedIn message objects.
 
     Raises:
-        Exception: If no chat_id is provided or if there's an API error.
+        ValueError: If no chat_id is provided.
+        Exception: If there's an API error.
     """
-    if not chat_id:
-        raise Exception('Chat ID is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/chats/{chat_id}/messages?account_id={id_to_use}"
+    url = get_base_url() + CHAT_MESSAGES_PATH.format(chat_id=quote(chat_id, safe=''))
+    params: Dict[str, Any] = {'account_id': id_to_use}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
     return response
 
+def iter_chat_messages(
+    chat_id: str,
+    account_id: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """
+    Iterates over every message of a LinkedIn conversation (chat).
+    
+    Pages are fetched with get_chat_messages, following the cursor of each response; the next
+    page is requested while the current one is being consumed.
+    
+    Args:
+        chat_id (str): The unique identifier for the LinkedIn chat.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of messages per page.
+    
+    Returns:
+        AsyncIterator[Any]: The messages, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_chat_messages.ainvoke({
+        'chat_id': chat_id,
+        'account_id': account_id,
+        'cursor': cursor,
+        'limit': page_size
+    }))
+
 @tool
+@require('chat_id', 'content')
 async def send_message(
     chat_id: str,
     content: str,
@@ -184,17 +222,11 @@ async def send_message(
         Any: The raw API response containing information about the sent message.
 
     Raises:
-        Exception: If chat_id or content is not provided, or if there's an API error.
+        ValueError: If chat_id or content is not provided.
+        Exception: If there's an API error.
     """
-    if not chat_id:
-        raise Exception('Chat ID is required')
-    
-    if not content:
-        raise Exception('Message content is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/chats/{chat_id}/messages"
+    url = get_base_url() + CHAT_MESSAGES_PATH.format(chat_id=quote(chat_id, safe=''))
     
     body: Dict[str, Any] = {
         'account_id': id_to_use,
@@ -208,12 +240,13 @@ async def send_message(
     response = await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps(body)
+        'body': orjson.dumps(body)
     })
     
     return response
 
 @tool
+@require('recipient_id', 'text')
 async def create_chat(
     recipient_id: str,
     text: str,
@@ -238,22 +271,16 @@ async def create_chat(
         Any: The raw API response containing information about the created chat and the sent message.
 
     Raises:
-        Exception: If recipient_id or text is not provided, or if there's an API error.
+        ValueError: If recipient_id or text is not provided.
+        Exception: If there's an API error.
     """
-    if not recipient_id:
-        raise Exception('Recipient ID is required')
-
-    if not text:
-        raise Exception('Message text is required')
-
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/chats"
+    url = get_base_url() + CHATS_PATH
 
     response = await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps({
+        'body': orjson.dumps({
             'account_id': id_to_use,
             'attendees_ids': [recipient_id],
             'text': text
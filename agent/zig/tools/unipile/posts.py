@@ -4,11 +4,21 @@ Unipile API - LinkedIn Posts
 This file contains functions for interacting with LinkedIn posts via the Unipile API.
 """
 
-import json
-from typing import List, Dict, Any, Optional, Union, Literal
-from .config import get_base_url, get_headers, make_request, ensure_account_id, PaginatedResponse
+import orjson
+from dataclasses import dataclass
+from urllib.parse import quote
+from typing import AsyncIterator, List, Dict, Any, Optional, Union, Literal
+from .config import get_base_url, get_headers, make_request, ensure_account_id, gather_bounded, iter_pages, require, ttl_cache, PaginatedResponse
+
+# API paths, relative to the base URL
+USER_POSTS_PATH = "/api/v1/users/{user_id}/posts"
+USER_COMMENTS_PATH = "/api/v1/users/{user_id}/comments"
+POSTS_PATH = "/api/v1/posts"
+POST_PATH = "/api/v1/posts/{post_id}"
+POST_COMMENTS_PATH = "/api/v1/posts/{post_id}/comments"
 
 # Types
+@dataclass(slots=True, frozen=True)
 class LinkedInPostAuthor:
     public_identifier: str
     id: str
@@ -16,6 +26,7 @@ class LinkedInPostAuthor:
     is_company: bool
     headline: Optional[str]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInPostAttachment:
     type: str
     url: Optional[str]
@@ -23,6 +34,7 @@ class LinkedInPostAttachment:
     title: Optional[str]
     description: Optional[str]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInPost:
     object: str
     provider: str
@@ -44,6 +56,7 @@ class LinkedInPost:
     reposted_by: Optional[LinkedInPostAuthor]
     repost_content: Optional[Dict[str, Any]]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInComment:
     object: str
     id: str
@@ -56,11 +69,17 @@ class LinkedInComment:
     reaction_counter: int
     reply_counter: int
 
+@ttl_cache(
+    ttl=300,
+    key=lambda user_id, account_id=None, cursor=None, limit=None: (user_id, account_id, cursor, limit)
+)
+@require('user_id')
 async def get_user_posts(
     user_id: str,
     account_id: Optional[str] = None,
     cursor: Optional[str] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    force_refresh: bool = False
 ) -> Any:
     """Retrieves posts published by a specific LinkedIn user.
 
@@ -78,32 +97,34 @@ async def get_user_posts(
         cursor (Optional[str]): A pagination cursor for retrieving the next set of posts.
                                This value is typically obtained from a previous API response.
         limit (Optional[int]): Maximum number of posts to return in a single request.
+        force_refresh (bool): Fetch the posts from the API even if a cached page (kept for
+                             up to five minutes) is available. Defaults to False.
 
     Returns:
         Any: The raw API response containing a paginated list of LinkedIn post objects.
 
     Raises:
-        Exception: If no user_id is provided or if there's an API error.
+        ValueError: If no user_id is provided.
+        Exception: If there's an API error.
     """
-    if not user_id:
-        raise Exception('User ID is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/users/{user_id}/posts?account_id={id_to_use}"
+    url = get_base_url() + USER_POSTS_PATH.format(user_id=quote(user_id, safe=''))
+    params: Dict[str, Any] = {'account_id': id_to_use}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
     return response
 
+@require('user_id')
 async def get_user_comments(
     user_id: str,
     account_id: Optional[str] = None,
@@ -130,68 +151,27 @@ async def get_user_comments(
         Any: The raw API response containing a paginated list of LinkedIn comment objects.
 
     Raises:
-        Exception: If no user_id is provided or if there's an API error.
+        ValueError: If no user_id is provided.
+        Exception: If there's an API error.
     """
-    if not user_id:
-        raise Exception('User ID is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/users/{user_id}/comments?account_id={id_to_use}"
+    url = get_base_url() + USER_COMMENTS_PATH.format(user_id=quote(user_id, safe=''))
+    params: Dict[str, Any] = {'account_id': id_to_use}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
     return response
 
-"""
-Creates and publishes a new post on LinkedIn.
-
-This function allows you to create and publish a new post on LinkedIn with specified text content
-and visibility settings. The post will be published on behalf of the authenticated user.
-
-Args:
-    text (str): The content of the LinkedIn post. This can include text, hashtags, and mentions.
-               LinkedIn may have character limits that apply to post content.
-    visibility (Literal['connections', 'public']): Controls who can see the post:
-                                                 - 'connections': Only your LinkedIn connections can see the post
-                                                 - 'public': Anyone on LinkedIn can see the post
-                                                 Default is 'connections'.
-    account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
-                               the function will use the UNIPILE_ACCOUNT_ID environment variable.
-    raw (bool): If True, returns the raw API response without cleaning. Default is False.
-
-Returns:
-    LinkedInPost: An object containing information about the created post:
-        - Post ID and share URL
-        - Post content
-        - Publication timestamp
-        - Initial engagement metrics (typically all zero)
-        - Author information
-        - Other post metadata
-
-Raises:
-    Exception: If no text is provided for the post or if there's an API error.
-
-Example:
-    ```python
-    # Create a post visible to connections only
-    new_post = await create_post("Excited to share my latest project! #innovation")
-    
-    # Create a public post
-    public_post = await create_post(
-        "Check out our company's new product launch!",
-        visibility="public"
-    )
-    ```
-"""
+@require('text')
 async def create_post(
     text: str,
     visibility: Literal['connections', 'public'] = 'connections',
@@ -218,19 +198,16 @@ async def create_post(
         Any: The raw API response containing information about the created post.
 
     Raises:
-        Exception: If no text is provided for the post or if there's an API error.
+        ValueError: If no text is provided for the post.
+        Exception: If there's an API error.
     """
-    if not text:
-        raise Exception('Post text is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/posts"
+    url = get_base_url() + POSTS_PATH
     
     response = await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps({
+        'body': orjson.dumps({
             'account_id': id_to_use,
             'text': text,
             'visibility': visibility
@@ -239,9 +216,12 @@ async def create_post(
     
     return response
 
+@ttl_cache(ttl=86400, key=lambda post_id, account_id=None: (post_id, account_id))
+@require('post_id')
 async def get_post(
     post_id: str,
-    account_id: Optional[str] = None
+    account_id: Optional[str] = None,
+    force_refresh: bool = False
 ) -> Any:
     """Retrieves a specific LinkedIn post by its ID.
 
@@ -253,27 +233,28 @@ async def get_post(
         post_id (str): The unique identifier of the LinkedIn post to retrieve.
         account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
                                    the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        force_refresh (bool): Fetch the post from the API even if a cached copy (kept for
+                             up to a day) is available. Defaults to False.
 
     Returns:
         Any: The raw API response containing information about the requested post.
 
     Raises:
-        Exception: If no post_id is provided or if there's an API error.
+        ValueError: If no post_id is provided.
+        Exception: If there's an API error.
     """
-    if not post_id:
-        raise Exception('Post ID is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/posts/{post_id}?account_id={id_to_use}"
+    url = get_base_url() + POST_PATH.format(post_id=quote(post_id, safe=''))
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': {'account_id': id_to_use}
     })
     
     return response
 
+@require('post_id')
 async def get_post_comments(
     post_id: str,
     account_id: Optional[str] = None,
@@ -299,68 +280,172 @@ async def get_post_comments(
         Any: The raw API response containing a paginated list of comments on the specified post.
 
     Raises:
-        Exception: If no post_id is provided or if there's an API error.
+        ValueError: If no post_id is provided.
+        Exception: If there's an API error.
     """
-    if not post_id:
-        raise Exception('Post ID is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/posts/{post_id}/comments?account_id={id_to_use}"
+    url = get_base_url() + POST_COMMENTS_PATH.format(post_id=quote(post_id, safe=''))
+    params: Dict[str, Any] = {'account_id': id_to_use}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
     response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
     return response
 
-"""
-Creates and publishes a comment on a LinkedIn post.
-
-This function allows you to add a comment to an existing LinkedIn post identified by its ID.
-The comment will be published on behalf of the authenticated user and will be visible to
-anyone who can see the original post.
-
-Args:
-    post_id (str): The unique identifier of the LinkedIn post to comment on.
-                  This is typically obtained from a previous call to get_user_posts() or similar functions.
-    text (str): The content of the comment. This can include text, hashtags, and mentions.
-               LinkedIn may have character limits that apply to comment content.
-    account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
-                               the function will use the UNIPILE_ACCOUNT_ID environment variable.
-    raw (bool): If True, returns the raw API response without cleaning. Default is False.
-
-Returns:
-    LinkedInComment: An object containing information about the created comment:
-        - Comment ID
-        - Comment text
-        - Publication timestamp
-        - Author information
-        - Post ID the comment belongs to
-        - Initial engagement metrics (typically all zero)
-        - Other comment metadata
-
-Raises:
-    Exception: If no post_id or text is provided, or if there's an API error.
-
-Example:
-    ```python
-    # Comment on a LinkedIn post
-    new_comment = await comment_on_post(
-        "post123456",
-        "Great insights! I particularly agree with your point about..."
+def iter_user_posts(
+    user_id: str,
+    account_id: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """Iterates over every post published by a LinkedIn user.
+
+    Pages are fetched with get_user_posts, following the cursor of each response; the
+    next page is requested while the current one is being consumed.
+
+    Args:
+        user_id (str): The LinkedIn provider ID of the user.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of posts per page.
+
+    Returns:
+        AsyncIterator[Any]: The user's posts, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_user_posts(user_id, account_id, cursor=cursor, limit=page_size))
+
+def iter_user_comments(
+    user_id: str,
+    account_id: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """Iterates over every comment made by a LinkedIn user.
+
+    Pages are fetched with get_user_comments, following the cursor of each response; the
+    next page is requested while the current one is being consumed.
+
+    Args:
+        user_id (str): The LinkedIn provider ID of the user.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of comments per page.
+
+    Returns:
+        AsyncIterator[Any]: The user's comments, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_user_comments(user_id, account_id, cursor=cursor, limit=page_size))
+
+def iter_post_comments(
+    post_id: str,
+    account_id: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """Iterates over every comment on a LinkedIn post.
+
+    Pages are fetched with get_post_comments, following the cursor of each response; the
+    next page is requested while the current one is being consumed.
+
+    Args:
+        post_id (str): The unique identifier of the LinkedIn post.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of comments per page.
+
+    Returns:
+        AsyncIterator[Any]: The post's comments, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_post_comments(post_id, account_id, cursor=cursor, limit=page_size))
+
+async def get_user_posts_bulk(
+    user_ids: List[str],
+    account_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    concurrency: int = 8
+) -> List[Any]:
+    """Retrieves the posts of several LinkedIn users concurrently.
+
+    Each user's first page of posts is fetched with get_user_posts, with at most
+    `concurrency` requests in flight at once.
+
+    Args:
+        user_ids (List[str]): The LinkedIn provider IDs of the users.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        limit (Optional[int]): Maximum number of posts to return per user.
+        concurrency (int): The maximum number of concurrent requests. Defaults to 8.
+
+    Returns:
+        List[Any]: The raw API response for each user, in order. Lookups that failed
+                   hold the raised exception instead.
+    """
+    return await gather_bounded(
+        lambda user_id: get_user_posts(user_id, account_id, limit=limit),
+        user_ids,
+        concurrency
     )
-    
-    # The comment ID can be used for future reference
-    comment_id = new_comment.get("id")
-    ```
-"""
+
+async def get_post_bulk(
+    post_ids: List[str],
+    account_id: Optional[str] = None,
+    concurrency: int = 8
+) -> List[Any]:
+    """Retrieves several LinkedIn posts concurrently.
+
+    Each post is fetched with get_post, with at most `concurrency` requests in flight
+    at once.
+
+    Args:
+        post_ids (List[str]): The unique identifiers of the LinkedIn posts.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        concurrency (int): The maximum number of concurrent requests. Defaults to 8.
+
+    Returns:
+        List[Any]: The raw API response for each post, in order. Lookups that failed
+                   hold the raised exception instead.
+    """
+    return await gather_bounded(
+        lambda post_id: get_post(post_id, account_id),
+        post_ids,
+        concurrency
+    )
+
+async def get_post_comments_bulk(
+    post_ids: List[str],
+    account_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    concurrency: int = 8
+) -> List[Any]:
+    """Retrieves the comments on several LinkedIn posts concurrently.
+
+    Each post's first page of comments is fetched with get_post_comments, with at most
+    `concurrency` requests in flight at once.
+
+    Args:
+        post_ids (List[str]): The unique identifiers of the LinkedIn posts.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        limit (Optional[int]): Maximum number of comments to return per post.
+        concurrency (int): The maximum number of concurrent requests. Defaults to 8.
+
+    Returns:
+        List[Any]: The raw API response for each post, in order. Lookups that failed
+                   hold the raised exception instead.
+    """
+    return await gather_bounded(
+        lambda post_id: get_post_comments(post_id, account_id, limit=limit),
+        post_ids,
+        concurrency
+    )
+
+@require('post_id', 'text')
 async def comment_on_post(
     post_id: str,
     text: str,
@@ -386,22 +471,16 @@ async def comment_on_post(
         Any: The raw API response containing information about the created comment.
 
     Raises:
-        Exception: If no post_id or text is provided, or if there's an API error.
+        ValueError: If no post_id or text is provided.
+        Exception: If there's an API error.
     """
-    if not post_id:
-        raise Exception('Post ID is required')
-    
-    if not text:
-        raise Exception('Comment text is required')
-    
     id_to_use = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/posts/{post_id}/comments"
+    url = get_base_url() + POST_COMMENTS_PATH.format(post_id=quote(post_id, safe=''))
     
     response = await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps({
+        'body': orjson.dumps({
             'account_id': id_to_use,
             'text': text
         })
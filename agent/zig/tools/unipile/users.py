@@ -4,18 +4,28 @@ Unipile API - LinkedIn Users
 This file contains functions for interacting with LinkedIn users via the Unipile API.
 """
 
-from .config import get_base_url, get_headers, make_request, ensure_account_id
-from .cleaners.users import (
-    clean_user_profile, 
-    clean_account_owner_profile, 
-    clean_user_relations, 
-    clean_invitations_received, 
-    clean_invitations_sent,
-    clean_send_invitation_response
-)
-from typing import Dict, Any, List, Optional
+import os
+import orjson
+from dataclasses import dataclass
+from .config import get_base_url, get_headers, make_request, ensure_account_id, gather_bounded, iter_pages, ttl_cache, TokenBucket, require, search_limiter
+from urllib.parse import quote
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+# API paths, relative to the base URL
+ACCOUNT_OWNER_PATH = "/api/v1/users/me"
+USER_PROFILE_PATH = "/api/v1/users/{identifier}"
+SEARCH_PATH = "/api/v1/linkedin/search"
+RELATIONS_PATH = "/api/v1/users/relations"
+INVITATIONS_SENT_PATH = "/api/v1/users/invite/sent"
+INVITATIONS_RECEIVED_PATH = "/api/v1/users/invite/received"
+INVITE_PATH = "/api/v1/users/invite"
+
+# LinkedIn restricts accounts that send invitations too quickly, so these are paced on
+# their own budget (per minute), on top of the shared UNIPILE_RPM
+_invite_limiter = TokenBucket(float(os.environ.get('UNIPILE_INVITE_RPM', '5')))
 
 # Types
+@dataclass(slots=True, frozen=True)
 class LinkedInUserProfile:
     object: str
     provider: str
@@ -41,6 +51,7 @@ class LinkedInUserProfile:
     profile_picture_url_large: Optional[str]
     background_picture_url: Optional[str]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInAccountOwnerProfile:
     object: str
     provider: str
@@ -60,6 +71,7 @@ class LinkedInAccountOwnerProfile:
     recruiter: Any
     sales_navigator: Any
 
+@dataclass(slots=True, frozen=True)
 class LinkedInUserRelation:
     object: str
     connection_urn: str
@@ -73,6 +85,7 @@ class LinkedInUserRelation:
     public_profile_url: str
     profile_picture_url: Optional[str]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInInvitation:
     object: str
     id: str
@@ -86,6 +99,7 @@ class LinkedInInvitation:
     inviter: Optional[Dict[str, str]]
     specifics: Optional[Dict[str, str]]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInSearchResult:
     type: str
     industry: Optional[str]
@@ -102,6 +116,7 @@ class LinkedInSearchResult:
     headline: Optional[str]
     verified: Optional[bool]
 
+@dataclass(slots=True, frozen=True)
 class LinkedInSearchResponse:
     object: str
     items: List[LinkedInSearchResult]
@@ -109,8 +124,10 @@ class LinkedInSearchResponse:
     paging: Dict[str, int]
     cursor: Optional[str]
 
+@ttl_cache(ttl=300, key=lambda account_id=None: account_id)
 async def get_account_owner_profile(
-    account_id: str = None
+    account_id: str = None,
+    force_refresh: bool = False
 ) -> Any:
     """Retrieves the LinkedIn profile of the currently authenticated user.
     
@@ -123,6 +140,8 @@ async def get_account_owner_profile(
     Args:
         account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
                                    the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        force_refresh (bool): Fetch the profile from the API even if a cached copy (kept for
+                             up to five minutes) is available. Defaults to False.
     
     Returns:
         Any: The raw API response containing the authenticated user's profile information.
@@ -131,19 +150,27 @@ async def get_account_owner_profile(
         Exception: If there's an API error during the request.
     """
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/users/me?account_id={id}"
+    url = get_base_url() + ACCOUNT_OWNER_PATH
     
-    response = make_request(url, {
+    response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': {'account_id': id}
     })
     
     return response
 
+@ttl_cache(
+    ttl=300,
+    maxsize=10000,
+    key=lambda identifier, account_id=None: (identifier, account_id),
+    error_ttl=30
+)
+@require('identifier')
 async def get_user_profile_by_identifier(
     identifier: str,
-    account_id: str = None
+    account_id: str = None,
+    force_refresh: bool = False
 ) -> Any:
     """Retrieves a LinkedIn user's profile by their public identifier.
     
@@ -159,27 +186,56 @@ async def get_user_profile_by_identifier(
                          linkedin.com/in/johndoe) or their provider ID.
         account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
                                    the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        force_refresh (bool): Fetch the profile from the API even if a cached copy (kept for
+                             up to five minutes) is available. Defaults to False. Failed
+                             lookups (e.g. unknown identifiers) are cached for 30 seconds.
     
     Returns:
         Any: The raw API response containing the user's profile information.
     
     Raises:
-        Exception: If no identifier is provided or if there's an API error.
+        ValueError: If no identifier is provided.
+        Exception: If there's an API error.
     """
-    if not identifier:
-        raise Exception('User identifier is required')
-    
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/users/{identifier}?account_id={id}"
+    url = get_base_url() + USER_PROFILE_PATH.format(identifier=quote(identifier, safe=''))
     
-    response = make_request(url, {
+    response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': {'account_id': id}
     })
     
     return response
 
+async def get_user_profiles(
+    identifiers: List[str],
+    account_id: str = None,
+    concurrency: int = 10
+) -> List[Any]:
+    """Retrieves several LinkedIn user profiles concurrently.
+    
+    Each profile is fetched with get_user_profile_by_identifier (and so shares its cache),
+    with at most `concurrency` requests in flight at once over the pooled connections of
+    the shared session.
+    
+    Args:
+        identifiers (List[str]): The LinkedIn users' public identifiers or provider IDs.
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        concurrency (int): The maximum number of concurrent requests. Defaults to 10.
+    
+    Returns:
+        List[Any]: The profile for each identifier, in order. Lookups that failed hold the
+                   raised exception instead.
+    """
+    return await gather_bounded(
+        lambda identifier: get_user_profile_by_identifier(identifier, account_id),
+        identifiers,
+        concurrency
+    )
+
+@require('keywords')
 async def search_linkedin(
     keywords: str,
     account_id: str = None,
@@ -196,20 +252,18 @@ async def search_linkedin(
     Returns:
         LinkedIn search results
     """
-    if not keywords:
-        raise Exception('Search keywords are required')
-    
     if options is None:
         options = {}
     
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/linkedin/search?account_id={id}"
+    url = get_base_url() + SEARCH_PATH
     
-    return make_request(url, {
+    await search_limiter.acquire()
+    return await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps({
+        'params': {'account_id': id},
+        'body': orjson.dumps({
             'api': options.get('api', 'classic'),
             'category': options.get('category', 'people'),
             'keywords': keywords,
@@ -221,8 +275,7 @@ async def search_linkedin(
 async def get_relations(
     account_id: str = None,
     cursor: str = None,
-    limit: int = None,
-    raw: bool = False
+    limit: int = None
 ) -> Any:
     """
     Retrieves the authenticated user's LinkedIn connections (1st-degree network).
@@ -237,10 +290,9 @@ async def get_relations(
         cursor (Optional[str]): A pagination cursor for retrieving the next set of connections.
                                This value is typically obtained from a previous API response.
         limit (Optional[int]): Maximum number of connections to return in a single request.
-        raw (bool): If True, returns the raw API response without cleaning. Default is False.
     
     Returns:
-        PaginatedResponse[LinkedInUserRelation]: A paginated list of LinkedIn connection objects, each containing:
+        Any: The raw API response containing a paginated list of LinkedIn connection objects, each containing:
             - Basic user information (first name, last name, headline)
             - Profile URLs and identifiers
             - Profile picture URL (if available)
@@ -257,35 +309,34 @@ async def get_relations(
         some_connections = await get_relations(limit=50)
         
         # Get next page of connections using cursor from previous response
-        next_connections = await get_relations(cursor=all_connections.cursor)
+        next_connections = await get_relations(cursor=all_connections['cursor'])
         
         # Print connection names
-        for connection in all_connections.items:
-            print(f"{connection.first_name} {connection.last_name} - {connection.headline}")
+        for connection in all_connections['items']:
+            print(f"{connection['first_name']} {connection['last_name']} - {connection['headline']}")
         ```
     """
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/users/relations?account_id={id}"
+    url = get_base_url() + RELATIONS_PATH
+    params: Dict[str, Any] = {'account_id': id}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
-    response = make_request(url, {
+    response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
-    # Return raw response if raw is true, otherwise clean and return
-    return response if raw else clean_user_relations(response)
+    return response
 
 async def get_invitations_sent(
     account_id: str = None,
     cursor: str = None,
-    limit: int = None,
-    raw: bool = False
+    limit: int = None
 ) -> Any:
     """
     Get invitations sent by the user
@@ -294,33 +345,31 @@ async def get_invitations_sent(
         account_id: Optional account ID (will use env var if not provided)
         cursor: Optional cursor for pagination
         limit: Optional limit for the number of results
-        raw: Whether to return the raw API response
     
     Returns:
         Invitations sent by the user
     """
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/users/invite/sent?account_id={id}"
+    url = get_base_url() + INVITATIONS_SENT_PATH
+    params: Dict[str, Any] = {'account_id': id}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
-    response = make_request(url, {
+    response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
-    # Return raw response if raw is true, otherwise clean and return
-    return response if raw else clean_invitations_sent(response)
+    return response
 
 async def get_invitations_received(
     account_id: str = None,
     cursor: str = None,
-    limit: int = None,
-    raw: bool = False
+    limit: int = None
 ) -> Any:
     """
     Get invitations received by the user
@@ -329,33 +378,92 @@ async def get_invitations_received(
         account_id: Optional account ID (will use env var if not provided)
         cursor: Optional cursor for pagination
         limit: Optional limit for the number of results
-        raw: Whether to return the raw API response
     
     Returns:
         Invitations received by the user
     """
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
     
-    url = f"{base_url}/api/v1/users/invite/received?account_id={id}"
+    url = get_base_url() + INVITATIONS_RECEIVED_PATH
+    params: Dict[str, Any] = {'account_id': id}
     if cursor:
-        url += f"&cursor={cursor}"
+        params['cursor'] = cursor
     if limit:
-        url += f"&limit={limit}"
+        params['limit'] = limit
     
-    response = make_request(url, {
+    response = await make_request(url, {
         'method': 'GET',
-        'headers': get_headers()
+        'headers': get_headers(),
+        'params': params
     })
     
-    # Return raw response if raw is true, otherwise clean and return
-    return response if raw else clean_invitations_received(response)
+    return response
+
+def iter_relations(
+    account_id: str = None,
+    page_size: int = None
+) -> AsyncIterator[Any]:
+    """
+    Iterates over all of the authenticated user's LinkedIn connections.
+    
+    Pages are fetched with get_relations, following the cursor of each response; the next
+    page is requested while the current one is being consumed.
+    
+    Args:
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of connections per page.
+    
+    Returns:
+        AsyncIterator[Any]: The connections, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_relations(account_id, cursor=cursor, limit=page_size))
+
+def iter_invitations_sent(
+    account_id: str = None,
+    page_size: int = None
+) -> AsyncIterator[Any]:
+    """
+    Iterates over every invitation sent by the user.
+    
+    Pages are fetched with get_invitations_sent, following the cursor of each response; the next
+    page is requested while the current one is being consumed.
+    
+    Args:
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of invitations per page.
+    
+    Returns:
+        AsyncIterator[Any]: The invitations, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_invitations_sent(account_id, cursor=cursor, limit=page_size))
 
+def iter_invitations_received(
+    account_id: str = None,
+    page_size: int = None
+) -> AsyncIterator[Any]:
+    """
+    Iterates over every invitation received by the user.
+    
+    Pages are fetched with get_invitations_received, following the cursor of each response; the next
+    page is requested while the current one is being consumed.
+    
+    Args:
+        account_id (Optional[str]): The Unipile account ID to use for the requests. If not provided,
+                                   the function will use the UNIPILE_ACCOUNT_ID environment variable.
+        page_size (Optional[int]): Maximum number of invitations per page.
+    
+    Returns:
+        AsyncIterator[Any]: The invitations, in the order returned by the API.
+    """
+    return iter_pages(lambda cursor: get_invitations_received(account_id, cursor=cursor, limit=page_size))
+
+@require('recipient_provider_id')
 async def send_invitation(
     recipient_provider_id: str,
     message: str = None,
-    account_id: str = None,
-    raw: bool = False
+    account_id: str = None
 ) -> Any:
     """
     Sends a LinkedIn connection request to another user.
@@ -371,17 +479,17 @@ async def send_invitation(
                                 LinkedIn limits this to 300 characters.
         account_id (Optional[str]): The Unipile account ID to use for this request. If not provided,
                                    the function will use the UNIPILE_ACCOUNT_ID environment variable.
-        raw (bool): If True, returns the raw API response without cleaning. Default is False.
     
     Returns:
-        Dict[str, Any]: An object containing information about the sent invitation:
+        Any: The raw API response containing information about the sent invitation:
             - Status of the invitation (pending, sent, etc.)
             - Timestamp of when the invitation was sent
             - Recipient information
             - Other invitation metadata
     
     Raises:
-        Exception: If no recipient_provider_id is provided or if there's an API error.
+        ValueError: If no recipient_provider_id is provided.
+        Exception: If there's an API error.
     
     Example:
         ```python
@@ -398,13 +506,10 @@ async def send_invitation(
     Note:
         LinkedIn has rate limits and restrictions on connection requests. Sending too many
         requests in a short period may result in temporary restrictions on your account.
+        Invitations are therefore paced to UNIPILE_INVITE_RPM per minute (5 by default).
     """
-    if not recipient_provider_id:
-        raise Exception('Recipient Provider ID is required')
-    
     id = ensure_account_id(account_id)
-    base_url = get_base_url()
-    url = f"{base_url}/api/v1/users/invite"
+    url = get_base_url() + INVITE_PATH
     
     body = {
         'account_id': id,
@@ -414,11 +519,11 @@ async def send_invitation(
     if message:
         body['message'] = message
     
-    response = make_request(url, {
+    await _invite_limiter.acquire()
+    response = await make_request(url, {
         'method': 'POST',
         'headers': get_headers(),
-        'body': json.dumps(body)
+        'body': orjson.dumps(body)
     })
     
-    # Return raw response if raw is true, otherwise clean and return
-    return response if raw else clean_send_invitation_response(response)
\ No newline at end of file
+    return response
\ No newline at end of file